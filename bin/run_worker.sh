@@ -0,0 +1,17 @@
+#!/bin/bash
+
+# Set environment options to exit immediately if a non-zero status code
+# appears from a command or within a pipe
+set -o errexit
+set -o pipefail
+
+cd fec
+# Send the RAD form submissions waiting in the outbox on to ServiceNow and
+# the queued page changes on to the search index, and keep the cached jobs
+# from USAJOBS fresh. Migrations are left to the web app.
+./manage.py drain_rad_outbox --loop &
+./manage.py process_search_index_queue --loop &
+./manage.py refresh_jobs --loop &
+
+# Exit as soon as any of them stops, so the platform restarts the worker
+wait -n
@@ -65,10 +65,10 @@ class Command(ImporterMixin, BaseCommand):
 
     def _create_pages(self, json_text: TextIOWrapper, parent_page: Page, options: dict) -> None:
         self._log('Creating new pages...')
-        for meeting_struct in json.load(json_text):
-            self._create_agenda_page(meeting_struct, parent_page)
+        pages = (self._agenda_page(meeting_struct) for meeting_struct in json.load(json_text))
+        self.add_pages(parent_page, pages, **options)
 
-    def _create_agenda_page(self, meeting: dict, parent_page: Page) -> None:
+    def _agenda_page(self, meeting: dict) -> MeetingPage:
         """
         Available keys are:
             ("agenda_document_links", Links), # list (Links)
@@ -99,7 +99,7 @@ class Command(ImporterMixin, BaseCommand):
         else:
             approved_minutes_link_import = ''
 
-        new_page = MeetingPage(
+        return MeetingPage(
             imported_html=self._raw_html_block(meeting['body']),
             date=datetime.datetime.strptime(meeting['posted_date']['iso8601'], '%Y-%m-%d').date(),
             meeting_type='O',
@@ -114,7 +114,6 @@ class Command(ImporterMixin, BaseCommand):
             live=1,
             title=meeting['title_text'] + ' open meeting',
         )
-        parent_page.add_child(instance=new_page)
 
     def _raw_html_block(self, legacy_cms_html: str) -> str:
         """
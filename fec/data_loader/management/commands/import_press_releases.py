@@ -1,5 +1,6 @@
 import glob
 import json
+import multiprocessing
 
 from dateutil import parser
 from slugify import slugify
@@ -7,7 +8,13 @@ from urllib.parse import urljoin
 
 from django.core.management import BaseCommand
 
-from data_loader.utils import ImporterMixin
+from data_loader.utils import (
+    BLOCKED_PAGE_TEXT,
+    ImporterMixin,
+    clean_content,
+    escape_quotes,
+    process_map
+)
 from fec.constants import press_release_page_categories
 from home.models import Page, PressReleasePage
 from home.utils.link_reroute import make_absolute_links
@@ -17,6 +24,30 @@ BASE_FEC_PRESS_URL = 'http://www.fec.gov/press/'
 DEFAULT_CATEGORY = 'other agency actions'
 
 
+def load_press_release(path):
+    """
+    Loads a press release and cleans its HTML and links. This is the slow
+    part of an import, so it runs in a pool of worker processes.
+    """
+
+    with open(path, 'r') as json_contents:
+        contents = json.load(json_contents)
+
+    if contents['title'] is None or contents['title'].isspace():
+        # This seems to be the case for the PR docs.
+        contents['title'] = contents['category']
+
+    clean_body = clean_content(contents['html'])
+    contents['blocked'] = BLOCKED_PAGE_TEXT in clean_body
+    linked_body = make_absolute_links(
+        urljoin(BASE_FEC_PRESS_URL, contents['href']),
+        clean_body
+    )
+    contents['html'] = escape_quotes(linked_body)
+
+    return path, contents
+
+
 class Command(ImporterMixin, BaseCommand):
     help = 'Imports press releases from JSON'
     requires_migrations_checks = True
@@ -39,6 +70,13 @@ class Command(ImporterMixin, BaseCommand):
             help='Import the records as raw HTML',
         )
 
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=multiprocessing.cpu_count(),
+            help='How many processes to clean the press releases with, defaults to one per CPU',
+        )
+
     def handle(self, *args, **options):
         if options['delete_existing']:
             self.stdout.write(
@@ -52,24 +90,29 @@ class Command(ImporterMixin, BaseCommand):
         base_page = Page.objects.get(url_path='/home/updates/')
         paths = sorted(glob.glob('data_loader/data/pr_json/' + '*.json'))
 
-        for path in paths:
-            with open(path, 'r') as json_contents:
-                if options['verbosity'] > 1:
-                    self.stdout.write((path))
+        self.add_pages(base_page, self.build_pages(paths, **options), **options)
 
-                contents = json.load(json_contents)
+        self.stdout.write(self.style.SUCCESS('Press releases imported.'))
 
-                if contents['title'] is None or contents['title'].isspace():
-                    # This seems to be the case for the PR docs.
-                    contents['title'] = contents['category']
+    def build_pages(self, paths, **options):
+        """
+        Yields the pages in the same order as the paths, with the files loaded
+        and cleaned by load_press_release() in the worker processes.
+        """
 
-                self.add_page(contents, base_page, **options)
+        for path, contents in process_map(load_press_release, paths, options['workers']):
+            if options['verbosity'] > 1:
+                self.stdout.write((path))
 
-        self.stdout.write(self.style.SUCCESS('Press releases imported.'))
+            if contents['blocked']:
+                self.stdout.write(self.style.NOTICE('-----BLOCKED PAGE------'))
+
+            yield self.build_page(contents, **options)
 
-    def add_page(self, item, base_page, **options):
+    def build_page(self, item, **options):
         """
-        Cleans the contents of a record and imports it as a page into Wagtail.
+        Returns a record, already cleaned by load_press_release(), as an
+        unsaved page.
         """
 
         # Determine if the body content should go into a RichTextBlock or a
@@ -93,20 +136,15 @@ class Command(ImporterMixin, BaseCommand):
 
         slug = slugify(str(item_year) + '-' + category + '-' + title)[:225]
         url_path = '/home/updates/' + slug + '/'
-        clean_body = self.clean_content(item['html'], **options)
-        linked_body = make_absolute_links(
-            urljoin(BASE_FEC_PRESS_URL, item['href']),
-            clean_body
-        )
-        body = self.escape_quotes(linked_body, **options)
-        body_list = [{"value": body, "type": block_type}]
+        body_list = [{"value": item['html'], "type": block_type}]
         formatted_body = json.dumps(body_list)
         publish_date = parser.parse(item['date'])
 
-        press_page = PressReleasePage(
+        return PressReleasePage(
             depth=4,
             numchild=0,
             title=title,
+            slug=slug,
             live=1,
             has_unpublished_changes='0',
             url_path=url_path,
@@ -119,22 +157,6 @@ class Command(ImporterMixin, BaseCommand):
             locked=0,
             latest_revision_created_at=publish_date,
             first_published_at=publish_date,
+            body=formatted_body,
+            date=publish_date,
         )
-
-        try:
-            base_page.add_child(instance=press_page)
-            saved_page = PressReleasePage.objects.get(id=press_page.id)
-            saved_page.body = formatted_body
-            saved_page.first_published_at = publish_date
-            saved_page.created_at = publish_date
-            saved_page.date = publish_date
-            saved_page.save()
-
-            if options['verbosity'] > 1:
-                self.stdout.write(self.style.SUCCESS(
-                    'Successfully added {0}.'.format(saved_page.id)
-                ))
-        except:
-            self.stdout.write(self.style.WARNING(
-                'Could not save page {0}'.format(press_page.title)
-            ))
@@ -7,7 +7,7 @@ from urllib.parse import urljoin
 
 from django.core.management import BaseCommand
 
-from data_loader.utils import ImporterMixin
+from data_loader.utils import BULK_CHUNK_SIZE, ImporterMixin, chunked
 from fec.constants import record_page_categories
 from home.models import Page, RecordPage, RecordPageAuthors
 from home.utils.link_reroute import make_absolute_links
@@ -77,13 +77,41 @@ class Command(ImporterMixin, BaseCommand):
                 self.stdout.write((options['json_file_path']))
 
             contents = json.load(json_contents)
-            self.add_page(contents, base_page, **options)
+            self.add_record_pages(contents, base_page, **options)
 
         self.stdout.write(self.style.SUCCESS('Record pages imported.'))
 
-    def add_page(self, contents, base_page, **options):
+    def add_record_pages(self, contents, base_page, **options):
         """
-        Cleans the contents of a record and imports it as a page into Wagtail.
+        Adds the record pages in bulk, then their keywords and authors, which
+        need each page to be saved again.
+        """
+
+        for chunk in chunked(self.build_pages(contents, **options), BULK_CHUNK_SIZE):
+            pages = [page for page, keywords, authors in chunk]
+            added = {page.id for page in self.add_pages(base_page, pages, **options)}
+
+            for page, keywords, authors in chunk:
+                if page.id not in added:
+                    continue
+                try:
+                    page.keywords.add(*keywords)
+                    record_page_authors = self.get_or_create_record_page_authors(
+                        authors,
+                        page,
+                        **options
+                    )
+                    page.authors.add(*record_page_authors)
+                    page.save()
+                except:
+                    self.stdout.write(self.style.WARNING(
+                        'Could not save the keywords and authors of page {0}'.format(page.title)
+                    ))
+
+    def build_pages(self, contents, **options):
+        """
+        Cleans the contents of each record and yields it as an unsaved page,
+        with its keywords and authors.
         """
 
         # Determine if the body content should go into a RichTextBlock or a
@@ -135,6 +163,7 @@ class Command(ImporterMixin, BaseCommand):
                 depth=4,
                 numchild=0,
                 title=title,
+                slug=slug,
                 live=1,
                 has_unpublished_changes='0',
                 url_path=url_path,
@@ -148,35 +177,12 @@ class Command(ImporterMixin, BaseCommand):
                 latest_revision_created_at=publish_date,
                 first_published_at=publish_date,
                 monthly_issue=monthly_issue_text,
-                monthly_issue_url=monthly_issue_url
+                monthly_issue_url=monthly_issue_url,
+                body=formatted_body,
+                date=publish_date,
             )
 
-            try:
-                base_page.add_child(instance=record_page)
-                saved_page = RecordPage.objects.get(id=record_page.id)
-                saved_page.body = formatted_body
-                saved_page.first_published_at = publish_date
-                saved_page.created_at = publish_date
-                saved_page.date = publish_date
-                saved_page.keywords.add(*keywords)
-
-                record_page_authors = self.get_or_create_record_page_authors(
-                    authors,
-                    saved_page,
-                    **options
-                )
-
-                saved_page.authors.add(*record_page_authors)
-                saved_page.save()
-
-                if options['verbosity'] > 1:
-                    self.stdout.write(self.style.SUCCESS(
-                        'Successfully added {0}.'.format(saved_page.id)
-                    ))
-            except:
-                self.stdout.write(self.style.WARNING(
-                    'Could not save page {0}'.format(record_page.title)
-                ))
+            yield record_page, keywords, authors
 
     def get_or_create_record_page_authors(self, authors, record_page, **options):
         """
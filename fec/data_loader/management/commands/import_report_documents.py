@@ -55,13 +55,13 @@ class Command(ImporterMixin, BaseCommand):
                 self.stdout.write((options['json_file_path']))
 
             contents = json.load(json_contents)
-            self.add_page(contents, base_page, **options)
+            self.add_pages(base_page, self.build_pages(contents, **options), **options)
 
         self.stdout.write(self.style.SUCCESS('Document pages imported.'))
 
-    def add_page(self, contents, base_page, **options):
+    def build_pages(self, contents, **options):
         """
-        Adds the report info to a new DocumentPage
+        Yields the report info as new unsaved DocumentPages
         Expects json in the format:
         [
           {
@@ -88,10 +88,11 @@ class Command(ImporterMixin, BaseCommand):
                 report_child_categories,
                 **options
             )
-            document_page = DocumentPage(
+            yield DocumentPage(
                 depth=4,
                 numchild=0,
                 title=title,
+                slug=slug,
                 file_url=item['url'],
                 size=size,
                 category=category,
@@ -106,23 +107,6 @@ class Command(ImporterMixin, BaseCommand):
                 owner_id=1,
                 locked=0,
                 latest_revision_created_at=publish_date,
-                first_published_at=publish_date
+                first_published_at=publish_date,
+                date=publish_date,
             )
-
-            try:
-                base_page.add_child(instance=document_page)
-                saved_page = DocumentPage.objects.get(id=document_page.id)
-                saved_page.first_published_at = publish_date
-                saved_page.created_at = publish_date
-                saved_page.date = publish_date
-
-                saved_page.save()
-
-                if options['verbosity'] > 1:
-                    self.stdout.write(self.style.SUCCESS(
-                        'Successfully added {0}.'.format(saved_page.id)
-                    ))
-            except:
-                self.stdout.write(self.style.WARNING(
-                    'Could not save page {0}'.format(document_page.title)
-                ))
@@ -54,13 +54,13 @@ class Command(ImporterMixin, BaseCommand):
                 self.stdout.write((options['json_file_path']))
 
             contents = json.load(json_contents)
-            self.add_page(contents, base_page, **options)
+            self.add_pages(base_page, self.build_pages(contents, **options), **options)
 
         self.stdout.write(self.style.SUCCESS('Tips pages imported.'))
 
-    def add_page(self, contents, base_page, **options):
+    def build_pages(self, contents, **options):
         """
-        Cleans the contents of a tip and imports it as a page into Wagtail.
+        Cleans the contents of each tip and yields it as an unsaved page.
         """
 
         # Determine if the body content should go into a RichTextBlock or a
@@ -86,10 +86,11 @@ class Command(ImporterMixin, BaseCommand):
             formatted_body = json.dumps(body_list)
             publish_date = parser.parse(item['posted_date'])
 
-            tip_page = TipsForTreasurersPage(
+            yield TipsForTreasurersPage(
                 depth=4,
                 numchild=0,
                 title=title,
+                slug=slug,
                 live=1,
                 has_unpublished_changes='0',
                 url_path=url_path,
@@ -100,24 +101,7 @@ class Command(ImporterMixin, BaseCommand):
                 owner_id=1,
                 locked=0,
                 latest_revision_created_at=publish_date,
-                first_published_at=publish_date
+                first_published_at=publish_date,
+                body=formatted_body,
+                date=publish_date,
             )
-
-            try:
-                base_page.add_child(instance=tip_page)
-                saved_page = TipsForTreasurersPage.objects.get(id=tip_page.id)
-                saved_page.body = formatted_body
-                saved_page.first_published_at = publish_date
-                saved_page.created_at = publish_date
-                saved_page.date = publish_date
-
-                saved_page.save()
-
-                if options['verbosity'] > 1:
-                    self.stdout.write(self.style.SUCCESS(
-                        'Successfully added {0}.'.format(saved_page.id)
-                    ))
-            except:
-                self.stdout.write(self.style.WARNING(
-                    'Could not save page {0}'.format(tip_page.title)
-                ))
@@ -54,19 +54,22 @@ class Command(ImporterMixin, BaseCommand):
         base_page = Page.objects.get(url_path='/home/updates/')
         paths = sorted(glob.glob('data_loader/data/digest_json/' + '*.json'))
 
+        self.add_pages(base_page, self.build_pages(paths, **options), **options)
+
+        self.stdout.write(self.style.SUCCESS('Weekly digests imported.'))
+
+    def build_pages(self, paths, **options):
         for path in paths:
             with open(path, 'r') as json_contents:
                 if options['verbosity'] > 1:
                     self.stdout.write((path))
 
                 contents = json.load(json_contents)
-                self.add_page(contents, base_page, **options)
+                yield self.build_page(contents, **options)
 
-        self.stdout.write(self.style.SUCCESS('Weekly digests imported.'))
-
-    def add_page(self, item, base_page, **options):
+    def build_page(self, item, **options):
         """
-        Cleans the contents of a record and imports it as a page into Wagtail.
+        Cleans the contents of a record and returns it as an unsaved page.
         """
 
         # Determine if the body content should go into a RichTextBlock or a
@@ -98,10 +101,11 @@ class Command(ImporterMixin, BaseCommand):
         formatted_body = json.dumps(body_list)
         publish_date = parser.parse(item['date'])
 
-        press_page = DigestPage(
+        return DigestPage(
             depth=4,
             numchild=0,
             title=title,
+            slug=slug,
             live=1,
             has_unpublished_changes='0',
             url_path=url_path,
@@ -113,22 +117,6 @@ class Command(ImporterMixin, BaseCommand):
             locked=0,
             latest_revision_created_at=publish_date,
             first_published_at=publish_date,
+            body=formatted_body,
+            date=publish_date,
         )
-
-        try:
-            base_page.add_child(instance=press_page)
-            saved_page = DigestPage.objects.get(id=press_page.id)
-            saved_page.body = formatted_body
-            saved_page.first_published_at = publish_date
-            saved_page.created_at = publish_date
-            saved_page.date = publish_date
-            saved_page.save()
-
-            if options['verbosity'] > 1:
-                self.stdout.write(self.style.SUCCESS(
-                    'Successfully added {0}.'.format(saved_page.id)
-                ))
-        except:
-            self.stdout.write(self.style.WARNING(
-                'Could not save page {0}'.format(press_page.title)
-            ))
@@ -0,0 +1,69 @@
+import unittest
+
+from datetime import date
+from unittest import mock
+
+from django.core.exceptions import ValidationError
+from django.test import TestCase
+
+from data_loader.utils import bulk_add_children, clean_content, process_map
+from home.models import HomePage, Page, RecordPage, UpdateFeedEntry
+from home.utils import cache as listing_cache
+
+
+class TestBulkAddChildren(TestCase):
+    def setUp(self):
+        self.home_page = HomePage.objects.get()
+        self.existing = RecordPage(title='Existing', slug='existing', category='statistics', date=date(2017, 8, 1))
+        self.home_page.add_child(instance=self.existing)
+
+    def record_page(self, title):
+        return RecordPage(title=title, category='statistics', date=date(2017, 8, 1), live=True)
+
+    def test_add_children(self):
+        pages = bulk_add_children(self.home_page, [self.record_page('One'), self.record_page('Two')])
+
+        self.assertEqual(
+            [page.title for page in self.home_page.get_children()],
+            ['Existing', 'One', 'Two']
+        )
+        self.assertEqual(Page.objects.get(id=self.home_page.id).numchild, 3)
+        self.assertEqual(Page.find_problems(), ([], [], [], [], []))
+
+        saved_page = RecordPage.objects.get(id=pages[1].id)
+        self.assertEqual(saved_page.url_path, self.home_page.url_path + 'two/')
+        self.assertEqual(saved_page.category, 'statistics')
+        self.assertEqual(saved_page.get_parent().id, self.home_page.id)
+
+        # The pages aren't published, but they're in the updates feed
+        self.assertEqual(
+            sorted(UpdateFeedEntry.objects.values_list('title', flat=True)),
+            ['One', 'Two']
+        )
+        # And can be searched
+        self.assertEqual(
+            [entry.page_id for entry in UpdateFeedEntry.objects.search('two')],
+            [pages[1].id]
+        )
+
+    @mock.patch.object(listing_cache.transaction, 'on_commit')
+    def test_invalidates_listings(self, on_commit):
+        versions = listing_cache.get_versions([RecordPage])
+        bulk_add_children(self.home_page, [self.record_page('One')])
+        for call in on_commit.call_args_list:
+            call[0][0]()
+        self.assertNotEqual(listing_cache.get_versions([RecordPage]), versions)
+
+    def test_slug_taken(self):
+        with self.assertRaises(ValidationError):
+            bulk_add_children(self.home_page, [self.record_page('New'), self.record_page('Existing')])
+        self.assertEqual(Page.objects.get(id=self.home_page.id).numchild, 1)
+        self.assertFalse(RecordPage.objects.filter(title='New').exists())
+
+
+class TestProcessMap(unittest.TestCase):
+    def test_in_order(self):
+        blocks = ['<pre>{}</pre>'.format(number) for number in range(50)]
+        expected = ['<div style="white-space: pre-wrap;">{}</div>'.format(number) for number in range(50)]
+        self.assertEqual(list(process_map(clean_content, blocks, 3)), expected)
+        self.assertEqual(list(process_map(clean_content, blocks, 1)), expected)
@@ -1,6 +1,15 @@
+import collections
+import itertools
+import multiprocessing
 import re
 
-from home.models import Author
+from django.core.exceptions import ValidationError
+from django.db import connections, transaction
+from django.db.models import F
+from django.utils.text import slugify
+
+from home.models import Author, Page, UpdateFeedEntry
+from home.utils.cache import invalidate_models
 
 CONTENT_SPECIFIC_REPLACEMENTS = [
     # deletions - these are from the header and we don't need them as part of the content
@@ -65,11 +74,160 @@ CONTENT_REGEX_REPLACEMENTS = [
     ('\.pdf version of this Weekly Digest', ''),
 ]
 
+# Text of the error page some of the legacy pages were saved as
+BLOCKED_PAGE_TEXT = """You have performed a blocked operation"""
+
+# How many pages to insert in one transaction
+BULK_CHUNK_SIZE = 500
+
+# How many items per worker process_map() sends ahead
+PROCESS_QUEUE_DEPTH = 4
+
 KEYWORD_REGEX_CLEANER = '\s?\r\n\s+'
 KEYWORD_SPLIT_CHARACTER = '|'
 KEYWORD_REPLACE_CHARACTER = ' '
 
 
+def clean_content(content_block):
+    """
+    Replaces or strips out unwanted and invalid pieces from the given
+    block of content.
+    """
+
+    for old, new in CONTENT_SPECIFIC_REPLACEMENTS:
+        content_block = str.replace(content_block, old, new)
+
+    for old, new in CONTENT_REGEX_REPLACEMENTS:
+        content_block = re.sub(old, new, content_block)
+
+    return content_block
+
+
+def escape_quotes(content_block):
+    """
+    Escapes single quotes to ensure content goes into a database correctly.
+    """
+
+    return content_block.replace("'", "&#39;")
+
+
+def process_map(function, items, workers):
+    """
+    Yields function(item) for each item, in order, working on them in a pool
+    of `workers` processes. Only a few items per worker are sent ahead of the
+    one being yielded, so results don't pile up in memory when whatever uses
+    them is slower. This suits CPU-bound work like parsing HTML on the way to
+    the one process that writes to the database. `function` has to be defined
+    at the top level of a module so the workers can find it, and shouldn't use
+    the database.
+    """
+
+    if workers <= 1:
+        yield from map(function, items)
+        return
+
+    # The workers are forked, and mustn't share the database connections
+    connections.close_all()
+    with multiprocessing.Pool(processes=workers) as pool:
+        pending = collections.deque()
+        for item in items:
+            if len(pending) >= workers * PROCESS_QUEUE_DEPTH:
+                yield pending.popleft().get()
+            pending.append(pool.apply_async(function, (item,)))
+        while pending:
+            yield pending.popleft().get()
+
+
+def chunked(items, size):
+    """Yields lists of up to `size` items from any iterable"""
+    items = iter(items)
+    chunk = list(itertools.islice(items, size))
+    while chunk:
+        yield chunk
+        chunk = list(itertools.islice(items, size))
+
+
+def set_page_pk(page, pk):
+    """Sets the ID of a page and the pointer to each table it inherits from"""
+    page.id = pk
+    for model in [type(page)] + page._meta.get_parent_list():
+        for link in model._meta.parents.values():
+            if link:
+                setattr(page, link.attname, pk)
+
+
+def bulk_add_children(parent, pages):
+    """
+    Adds unsaved pages as the last children of `parent`, in one transaction
+    and with a few queries however many pages there are, where
+    parent.add_child() takes several queries per page.
+
+    The treebeard paths for the whole batch are allocated from the parent's
+    last child while the parent row is locked, the Page rows and then each
+    specific table's rows are inserted with one statement each, and the
+    parent's numchild is updated once. Like add_child(), this doesn't save
+    revisions, and it also skips Page.save(), so signals aren't sent and
+    child relations like tags have to be saved afterwards. The update feed
+    entries that publishing would add are added here instead, and the
+    cached listings of the pages' types are invalidated.
+
+    Raises ValidationError if a slug is already taken under the parent.
+    """
+    if not pages:
+        return []
+    step_length = Page.steplen
+
+    with transaction.atomic():
+        parent = Page.objects.select_for_update().get(pk=parent.pk)
+        last_child = parent.get_last_child()
+        last_step = Page._str2int(last_child.path[-step_length:]) if last_child else 0
+
+        for step, page in enumerate(pages, start=last_step + 1):
+            page.depth = parent.depth + 1
+            page.path = Page._get_path(parent.path, page.depth, step)
+            page.numchild = 0
+            if not page.slug:
+                page.slug = slugify(page.title)
+            page.set_url_path(parent)
+
+        slugs = [page.slug for page in pages]
+        taken = set(parent.get_children().filter(slug__in=slugs).values_list('slug', flat=True))
+        taken.update(slug for slug in slugs if slugs.count(slug) > 1)
+        if taken:
+            raise ValidationError({'slug': ['These slugs are already in use: {}'.format(', '.join(sorted(taken)))]})
+
+        try:
+            rows = Page.objects.bulk_create([
+                Page(**{field.attname: getattr(page, field.attname) for field in Page._meta.concrete_fields})
+                for page in pages
+            ])
+            for page, row in zip(pages, rows):
+                set_page_pk(page, row.pk)
+
+            # Then the rows of each table between Page and the specific models
+            for model, model_pages in itertools.groupby(pages, key=type):
+                model_pages = list(model_pages)
+                for table in reversed([model] + model._meta.get_parent_list()):
+                    if table is Page:
+                        continue
+                    table._base_manager._insert(model_pages, fields=table._meta.local_concrete_fields)
+        except Exception:
+            for page in pages:
+                set_page_pk(page, None)
+            raise
+
+        Page.objects.filter(pk=parent.pk).update(numchild=F('numchild') + len(pages))
+
+        # Nothing is published, so add the update feed entries and invalidate
+        # the cached listings, as the page_published signal would have
+        UpdateFeedEntry.create_for_pages(pages)
+        invalidate_models(type(page) for page in pages)
+
+    for page in pages:
+        page._state.adding = False
+    return pages
+
+
 class ImporterMixin(object):
     """
     A mixin object to provide a base set of common methods for all of the
@@ -102,20 +260,46 @@ class ImporterMixin(object):
             self.style.SUCCESS('Completed deleting existing {0}'.format(model.__name__))
         )
 
+    def add_pages(self, base_page, pages, **options):
+        """
+        Adds pages under base_page in chunks of BULK_CHUNK_SIZE with
+        bulk_add_children(). If a chunk can't be saved, its pages are added one
+        at a time so only the ones that fail are skipped.
+
+        Returns the pages that were added.
+        """
+
+        added = []
+
+        for chunk in chunked(pages, BULK_CHUNK_SIZE):
+            try:
+                added.extend(bulk_add_children(base_page, chunk))
+            except Exception:
+                for page in chunk:
+                    try:
+                        added.extend(bulk_add_children(base_page, [page]))
+                    except Exception:
+                        self.stdout.write(self.style.WARNING(
+                            'Could not save page {0}'.format(page.title)
+                        ))
+
+            if options.get('verbosity', 1) > 1:
+                self.stdout.write(self.style.SUCCESS(
+                    'Successfully added {0} pages.'.format(len(added))
+                ))
+
+        return added
+
     def clean_content(self, content_block, **options):
         """
         Replaces or strips out unwanted and invalid pieces from the given
         block of content.
         """
 
-        for old, new in CONTENT_SPECIFIC_REPLACEMENTS:
-            content_block = str.replace(content_block, old, new)
-
-        for old, new in CONTENT_REGEX_REPLACEMENTS:
-            content_block = re.sub(old, new, content_block)
+        content_block = clean_content(content_block)
 
         # Flag
-        if """You have performed a blocked operation""" in content_block:
+        if BLOCKED_PAGE_TEXT in content_block:
             self.stdout.write(self.style.NOTICE('-----BLOCKED PAGE------'))
 
         return content_block
@@ -125,7 +309,7 @@ class ImporterMixin(object):
         Escapes single quotes to ensure content goes into a database correctly.
         """
 
-        return content_block.replace("'", "&#39;")
+        return escape_quotes(content_block)
 
     def wrap_with_paragraph(self, content_block, **options):
         """
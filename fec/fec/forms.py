@@ -1,14 +1,37 @@
+import logging
 import requests
 import json
+import threading
+import time
 
 from django import forms
 from django.conf import settings
+from django.core.cache import cache
+from django.db import connection
+
+from fec import http
+from home.models import RADSubmission
+
+logger = logging.getLogger(__name__)
 
 # ServiceNow credentials
 username = settings.FEC_SERVICE_NOW_USERNAME
 password = settings.FEC_SERVICE_NOW_PASSWORD
 base_url = settings.FEC_SERVICE_NOW_API
 
+# (connect, read) timeouts in seconds for fetching the categories
+CATEGORIES_TIMEOUT = (3.05, 5)
+
+# The categories are refreshed in the background when older than this
+CATEGORIES_REFRESH_INTERVAL = 60 * 60
+
+# After a failed fetch, the categories aren't fetched again for this long
+CATEGORIES_RETRY_INTERVAL = 60
+
+CATEGORIES_KEY = 'service-now:rad-categories'
+CATEGORIES_LOCK_KEY = 'service-now:rad-categories-lock'
+CATEGORIES_FAILED_KEY = 'service-now:rad-categories-failed'
+
 class ContactRAD(forms.Form):
     """
     Generates a contact form for submitting questions to RAD
@@ -28,21 +51,28 @@ class ContactRAD(forms.Form):
         self.fields['u_description'] = forms.CharField(label='Question', widget=forms.Textarea, required=True)
         self.fields['u_committee_member_certification'] = forms.BooleanField(label='I agree', required=True)
 
-    def post_to_service_now(self):
+    def queue_for_service_now(self):
         """
-        Process the data and post it to the ServiceNow endpoint
-        Returns a status code from the request
+        Saves the submission to the outbox, which drain_rad_outbox sends on to
+        ServiceNow. Returns the RADSubmission, or None if the form is invalid.
         """
-
-        # Remove the committee name from the data
-        if self.is_valid() and base_url:
-            data = self.cleaned_data
+        if self.is_valid():
+            data = dict(self.cleaned_data)
             del data['committee_name']
+            return RADSubmission.objects.create(data=data)
 
-            # Post to ServiceNow
-            post_url = base_url + 'u_imp_rad_response'
-            post = requests.post(post_url, data=json.dumps(data), auth=(username, password))
-            return post.status_code
+
+def send_to_service_now(data, idempotency_key=None):
+    """
+    Posts a RAD submission to ServiceNow and returns the response.
+    The idempotency key is sent as its own field. ServiceNow doesn't
+    deduplicate on it, but a submission that was sent twice can be spotted
+    and matched up by it.
+    """
+    if idempotency_key:
+        data = dict(data, u_idempotency_key=str(idempotency_key))
+    post_url = base_url + 'u_imp_rad_response'
+    return http.post('servicenow', post_url, data=json.dumps(data), auth=(username, password))
 
 
 def fetch_categories():
@@ -54,21 +84,77 @@ def fetch_categories():
 
     if base_url:
         category_url = base_url + 'sys_choice?table=u_rad_response&element=u_category'
-        r = requests.get(category_url, auth=(username, password))
+        r = http.get('servicenow', category_url, auth=(username, password), timeout=CATEGORIES_TIMEOUT)
+        r.raise_for_status()
         return r.json()['result']
     else:
         return []
 
 
-def form_categories():
+def parse_categories(raw_categories):
     """
-    Calls the fetch_categories function and processes the results by grabbing
-    the value and label from each result item and storing it as a tuple
+    Grabs the value and label from each result item and stores it as a tuple
     which is then used as the choices for the category form field
     """
-    raw_categories = fetch_categories()
     categories = []
     for cat in raw_categories:
       if 'value' in cat:
         categories.append((cat['value'], cat['label']))
     return categories
+
+
+def refresh_categories():
+    """
+    Fetches the categories and caches them with no expiry, so the last good
+    list is kept if ServiceNow is slow or down.
+    Returns the categories, or None if they couldn't be fetched
+    """
+    try:
+        categories = parse_categories(fetch_categories())
+    except (requests.RequestException, ValueError, KeyError, TypeError):
+        logger.exception('Could not refresh the RAD categories from ServiceNow')
+        cache.set(CATEGORIES_FAILED_KEY, True, CATEGORIES_RETRY_INTERVAL)
+        return None
+
+    cache.set(CATEGORIES_KEY, {'categories': categories, 'fetched_at': time.time()}, None)
+    return categories
+
+
+def refresh_categories_in_background():
+    """
+    Refreshes the categories in a thread, unless another worker already is or
+    the last fetch failed less than CATEGORIES_RETRY_INTERVAL ago
+    """
+    if cache.get(CATEGORIES_FAILED_KEY) or not cache.add(CATEGORIES_LOCK_KEY, True, 60):
+        return
+
+    def refresh():
+        try:
+            refresh_categories()
+        finally:
+            cache.delete(CATEGORIES_LOCK_KEY)
+            # The cache is in the database, so the thread has a connection
+            connection.close()
+
+    thread = threading.Thread(target=refresh, name='refresh-rad-categories')
+    thread.daemon = True
+    thread.start()
+
+
+def form_categories():
+    """
+    Returns the cached categories straight away, refreshing them in the
+    background when they're missing or stale, so rendering the form never
+    waits on ServiceNow. Workers warm the cache when they boot, and until
+    the first refresh has finished there are no categories to show.
+    """
+    cached = cache.get(CATEGORIES_KEY)
+    if cached is None or time.time() - cached['fetched_at'] > CATEGORIES_REFRESH_INTERVAL:
+        refresh_categories_in_background()
+    return cached['categories'] if cached else []
+
+
+def warm_categories():
+    """Fills the cache in the background if it's empty, when a worker boots"""
+    if base_url and cache.get(CATEGORIES_KEY) is None:
+        refresh_categories_in_background()
@@ -0,0 +1,119 @@
+"""
+The HTTP client for every outbound integration: the FEC API, DigitalGov
+search and i14y, USAJOBS and ServiceNow.
+
+Each upstream gets its own requests.Session, shared by the whole process, so
+connections are kept alive and reused instead of paying for a new TCP and
+TLS handshake on every call. Requests get the upstream's default timeout
+unless they pass their own, idempotent requests are retried with backoff on
+connection errors and 502/503/504s, and the latency and errors of each
+upstream are counted for `stats()`.
+
+    from fec import http
+    response = http.get('fec-api', url, params={'q': query})
+"""
+import logging
+import threading
+import time
+
+from collections import defaultdict
+
+import requests
+
+from requests.adapters import HTTPAdapter
+from requests.packages.urllib3.util.retry import Retry
+
+logger = logging.getLogger(__name__)
+
+# Default settings for each upstream. Timeouts are (connect, read) in seconds,
+# and retries only apply to idempotent methods like GET, PUT and DELETE.
+UPSTREAMS = {
+    'fec-api': {'timeout': (3.05, 10), 'retries': 1},
+    'digitalgov': {'timeout': (3.05, 10), 'retries': 1},
+    'i14y': {'timeout': (3.05, 30), 'retries': 3},
+    'usajobs': {'timeout': (3.05, 5), 'retries': 1},
+    'servicenow': {'timeout': (3.05, 30), 'retries': 2},
+    # fec.gov and transition.fec.gov, for scraping pages to index
+    'fec-web': {'timeout': (3.05, 30), 'retries': 3},
+}
+
+# Connections kept open to each host of an upstream
+POOL_SIZE = 10
+
+sessions = {}
+sessions_lock = threading.Lock()
+
+counters = defaultdict(lambda: {'requests': 0, 'errors': 0, 'seconds': 0.0})
+counters_lock = threading.Lock()
+
+
+def make_session(upstream):
+    config = UPSTREAMS[upstream]
+    retry = Retry(
+        total=config['retries'],
+        backoff_factor=0.5,
+        status_forcelist=[502, 503, 504],
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(pool_connections=POOL_SIZE, pool_maxsize=POOL_SIZE, max_retries=retry)
+    session = requests.Session()
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return session
+
+
+def get_session(upstream):
+    """Returns the shared session for an upstream, creating it the first time"""
+    if upstream not in sessions:
+        with sessions_lock:
+            if upstream not in sessions:
+                sessions[upstream] = make_session(upstream)
+    return sessions[upstream]
+
+
+def record(upstream, seconds, error):
+    with counters_lock:
+        counter = counters[upstream]
+        counter['requests'] += 1
+        counter['seconds'] += seconds
+        if error:
+            counter['errors'] += 1
+
+
+def stats():
+    """
+    Returns {upstream: {'requests', 'errors', 'seconds'}} for this process.
+    Responses with a 5xx status count as errors.
+    """
+    with counters_lock:
+        return {upstream: dict(counter) for upstream, counter in counters.items()}
+
+
+def request(upstream, method, url, **kwargs):
+    """Makes a request to one of the UPSTREAMS with its session and defaults"""
+    kwargs.setdefault('timeout', UPSTREAMS[upstream]['timeout'])
+    start = time.time()
+    try:
+        response = get_session(upstream).request(method, url, **kwargs)
+    except requests.RequestException:
+        record(upstream, time.time() - start, error=True)
+        logger.warning('%s %s to %s failed', method, url, upstream)
+        raise
+    record(upstream, time.time() - start, error=response.status_code >= 500)
+    return response
+
+
+def get(upstream, url, **kwargs):
+    return request(upstream, 'GET', url, **kwargs)
+
+
+def post(upstream, url, **kwargs):
+    return request(upstream, 'POST', url, **kwargs)
+
+
+def put(upstream, url, **kwargs):
+    return request(upstream, 'PUT', url, **kwargs)
+
+
+def delete(upstream, url, **kwargs):
+    return request(upstream, 'DELETE', url, **kwargs)
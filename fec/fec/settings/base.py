@@ -121,6 +121,22 @@ DATABASES = {
     'default': dj_database_url.config()
 }
 
+# Cache
+# https://docs.djangoproject.com/en/1.10/topics/cache/
+
+# Every gunicorn worker on every instance has to see the same cached pages,
+# feeds and cache versions, so the cache lives in the database rather than in
+# each process. The table is created by the home app's migrations.
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.db.DatabaseCache',
+        'LOCATION': 'django_cache',
+        'OPTIONS': {
+            'MAX_ENTRIES': 10000,
+        },
+    }
+}
+
 
 # Internationalization
 # https://docs.djangoproject.com/en/1.8/topics/i18n/
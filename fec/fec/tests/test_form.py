@@ -1,8 +1,10 @@
 import unittest
 import fec.forms
 import requests
+import time
 
 from unittest import mock
+from django.core.cache import cache
 from django.test import TestCase
 from fec.forms import ContactRAD
 
@@ -28,19 +30,18 @@ class TestContactForm(TestCase):
     form = ContactRAD(self.form_data)
     self.assertTrue(form.is_valid())
 
-  def test_empty_submission(self):
+  @mock.patch.object(fec.forms, 'form_categories', return_value=[])
+  def test_empty_submission(self, form_categories):
     form = ContactRAD({})
     self.assertFalse(form.is_valid())
 
   @mock.patch.object(fec.forms, 'form_categories')
-  @mock.patch.object(fec.forms.requests, 'post')
-  def test_post_to_service_now(self, mock_post, form_categories):
+  def test_queue_for_service_now(self, form_categories):
     form_categories.return_value = [('fake', 'Fake category')]
     # Test to make sure this method removes the `committee_name` field
     form = ContactRAD(self.form_data)
-    form.post_to_service_now()
-    call_data = mock_post.call_args[1]['data']
-    self.assertFalse('committee_name' in call_data)
+    submission = form.queue_for_service_now()
+    self.assertFalse('committee_name' in submission.data)
 
   @mock.patch.object(fec.forms, 'fetch_categories')
   def test_get_categories(self, fetch):
@@ -48,3 +49,56 @@ class TestContactForm(TestCase):
     categories = [('fake', 'Fake category')]
     # It should return a list of tuples
     self.assertEqual(categories[0], ('fake', 'Fake category'))
+
+class TestFormCategories(TestCase):
+  def setUp(self):
+    cache.clear()
+
+  @mock.patch.object(fec.forms, 'fetch_categories')
+  def test_cached(self, fetch):
+    fetch.return_value = [{'value': 'fake', 'label': 'Fake category'}]
+    fec.forms.refresh_categories()
+    self.assertEqual(fec.forms.form_categories(), [('fake', 'Fake category')])
+    # It only asks ServiceNow once
+    self.assertEqual(fec.forms.form_categories(), [('fake', 'Fake category')])
+    self.assertEqual(fetch.call_count, 1)
+
+  @mock.patch.object(fec.forms, 'refresh_categories_in_background')
+  @mock.patch.object(fec.forms, 'fetch_categories')
+  def test_cold_cache(self, fetch, refresh_in_background):
+    # It doesn't wait on ServiceNow when nothing is cached yet
+    self.assertEqual(fec.forms.form_categories(), [])
+    refresh_in_background.assert_called_once_with()
+    fetch.assert_not_called()
+
+  @mock.patch.object(fec.forms, 'refresh_categories_in_background')
+  @mock.patch.object(fec.forms, 'fetch_categories')
+  def test_stale(self, fetch, refresh_in_background):
+    # It serves stale categories while refreshing them in the background
+    fetched_at = time.time() - fec.forms.CATEGORIES_REFRESH_INTERVAL - 1
+    cache.set(fec.forms.CATEGORIES_KEY, {'categories': [('old', 'Old')], 'fetched_at': fetched_at})
+    self.assertEqual(fec.forms.form_categories(), [('old', 'Old')])
+    refresh_in_background.assert_called_once_with()
+    fetch.assert_not_called()
+
+  @mock.patch.object(fec.forms, 'fetch_categories')
+  def test_last_known_good(self, fetch):
+    # It keeps the last good categories when ServiceNow is down
+    cache.set(fec.forms.CATEGORIES_KEY, {'categories': [('old', 'Old')], 'fetched_at': 0})
+    fetch.side_effect = requests.Timeout
+    self.assertIsNone(fec.forms.refresh_categories())
+    self.assertEqual(cache.get(fec.forms.CATEGORIES_KEY)['categories'], [('old', 'Old')])
+
+  @mock.patch('threading.Thread')
+  @mock.patch.object(fec.forms, 'fetch_categories')
+  def test_retry_interval(self, fetch, thread):
+    # After a failed fetch, it doesn't try again on every render
+    fetch.side_effect = requests.Timeout
+    self.assertIsNone(fec.forms.refresh_categories())
+    fec.forms.refresh_categories_in_background()
+    thread.assert_not_called()
+
+    # Until the failure expires
+    cache.delete(fec.forms.CATEGORIES_FAILED_KEY)
+    fec.forms.refresh_categories_in_background()
+    thread.assert_called_once_with(target=mock.ANY, name='refresh-rad-categories')
@@ -0,0 +1,34 @@
+import requests
+import requests_mock
+
+from unittest import mock
+from django.test import TestCase
+
+from fec import http
+
+
+class TestHttp(TestCase):
+  def setUp(self):
+    http.counters.clear()
+
+  def test_shared_session(self):
+    # Each upstream keeps one session, so connections are reused
+    self.assertIs(http.get_session('fec-api'), http.get_session('fec-api'))
+    self.assertIsNot(http.get_session('fec-api'), http.get_session('usajobs'))
+
+  @requests_mock.Mocker()
+  def test_default_timeout(self, m):
+    m.get('https://api.open.fec.gov/v1/candidates', json={})
+    with mock.patch.object(requests.Session, 'request', wraps=http.get_session('fec-api').request) as request:
+      http.get('fec-api', 'https://api.open.fec.gov/v1/candidates')
+      self.assertEqual(request.call_args[1]['timeout'], http.UPSTREAMS['fec-api']['timeout'])
+
+  @requests_mock.Mocker()
+  def test_stats(self, m):
+    m.get('https://api.open.fec.gov/v1/candidates', json={})
+    m.get('https://api.open.fec.gov/v1/committees', status_code=503)
+    http.get('fec-api', 'https://api.open.fec.gov/v1/candidates')
+    http.get('fec-api', 'https://api.open.fec.gov/v1/committees')
+    stats = http.stats()['fec-api']
+    self.assertEqual(stats['requests'], 2)
+    self.assertEqual(stats['errors'], 1)
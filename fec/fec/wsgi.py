@@ -22,3 +22,7 @@ newrelic.agent.initialize()
 
 application = get_wsgi_application()
 application = DjangoWhiteNoise(application)
+
+# Fetch the RAD form's categories now rather than on the first request for it
+from fec.forms import warm_categories  # noqa
+warm_categories()
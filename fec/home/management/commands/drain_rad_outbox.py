@@ -0,0 +1,66 @@
+import time
+
+import requests
+
+from django.core.management import BaseCommand
+
+from fec.forms import send_to_service_now
+from home.models import RADSubmission
+
+
+class Command(BaseCommand):
+    help = 'Sends the RAD form submissions waiting in the outbox to ServiceNow'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=50,
+            help='How many submissions to claim and send at a time'
+        )
+        parser.add_argument(
+            '--loop',
+            action='store_true',
+            help='Keep draining the outbox instead of stopping once it is empty'
+        )
+        parser.add_argument(
+            '--interval',
+            type=int,
+            default=10,
+            help='Seconds to wait between polls of an empty outbox with --loop'
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            sent, failed = self.drain(options['batch_size'])
+            if sent or failed:
+                self.stdout.write('Sent {} submissions, {} failed'.format(sent, failed))
+            if not options['loop']:
+                break
+            if not sent and not failed:
+                time.sleep(options['interval'])
+
+    def drain(self, batch_size):
+        """Sends batches of due submissions until none are left"""
+        sent = failed = 0
+        while True:
+            batch = list(RADSubmission.due()[:batch_size])
+            if not batch:
+                return sent, failed
+
+            # Claim each row for long enough to send the whole batch
+            lease = 60 * len(batch)
+            for submission in batch:
+                if not submission.claim(lease):
+                    continue
+                try:
+                    response = send_to_service_now(submission.data, submission.idempotency_key)
+                    response.raise_for_status()
+                except requests.RequestException as error:
+                    submission.mark_failed(error)
+                    failed += 1
+                    if submission.status == RADSubmission.FAILED:
+                        self.stderr.write('Giving up on submission {}: {}'.format(submission, error))
+                else:
+                    submission.mark_sent()
+                    sent += 1
@@ -0,0 +1,24 @@
+from django.core.management import BaseCommand
+from django.db import transaction
+
+from home.models import UPDATE_FEED_MODELS, UpdateFeedEntry
+from home.utils.cache import invalidate_models
+
+
+class Command(BaseCommand):
+    help = 'Rebuilds the UpdateFeedEntry table from every live update page'
+
+    def handle(self, *args, **options):
+        self.stdout.write(self.style.WARNING('Rebuilding the update feed...'))
+
+        with transaction.atomic():
+            UpdateFeedEntry.objects.all().delete()
+            for update_type, model in UPDATE_FEED_MODELS.items():
+                count = 0
+                for page in model.objects.live().iterator():
+                    UpdateFeedEntry.update_for_page(page)
+                    count += 1
+                self.stdout.write('{}: {} entries'.format(update_type, count))
+            invalidate_models(UPDATE_FEED_MODELS.values())
+
+        self.stdout.write(self.style.SUCCESS('All done'))
@@ -0,0 +1,36 @@
+import time
+
+from django.core.management import BaseCommand, CommandError
+
+from home.utils.jobs_feed import JOBS_REFRESH_INTERVAL, refresh_jobs
+
+
+class Command(BaseCommand):
+    help = 'Fetches the open positions from USAJOBS and caches them for the careers block'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--loop',
+            action='store_true',
+            help='Keep refreshing the jobs instead of stopping after one refresh'
+        )
+        parser.add_argument(
+            '--interval',
+            type=int,
+            # Often enough that renders don't find the jobs stale in between
+            default=JOBS_REFRESH_INTERVAL // 3,
+            help='Seconds to wait between refreshes with --loop'
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            jobs = refresh_jobs()
+            if jobs is None:
+                if not options['loop']:
+                    raise CommandError('Could not refresh the jobs from USAJOBS')
+                self.stderr.write('Could not refresh the jobs from USAJOBS')
+            else:
+                self.stdout.write(self.style.SUCCESS('Cached {} jobs'.format(len(jobs))))
+            if not options['loop']:
+                break
+            time.sleep(options['interval'])
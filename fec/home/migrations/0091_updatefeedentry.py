@@ -0,0 +1,43 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contenttypes', '0002_remove_content_type_name'),
+        ('wagtailcore', '0032_add_bulk_delete_page_permission'),
+        ('home', '0090_auto_20170811_1840'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='UpdateFeedEntry',
+            fields=[
+                ('page', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='+', serialize=False, to='wagtailcore.Page')),
+                ('update_type', models.CharField(max_length=255)),
+                ('date', models.DateField(db_index=True)),
+                ('category', models.CharField(blank=True, max_length=255)),
+                ('meeting_type', models.CharField(blank=True, max_length=2)),
+                ('homepage_pin', models.BooleanField(default=False)),
+                ('homepage_pin_start', models.DateField(blank=True, null=True)),
+                ('homepage_pin_expiration', models.DateField(blank=True, null=True)),
+                ('homepage_hide', models.BooleanField(default=False)),
+                ('title', models.CharField(max_length=255)),
+                ('formatted_title', models.CharField(blank=True, max_length=255)),
+                ('url', models.CharField(blank=True, max_length=255)),
+                ('excerpt', models.TextField(blank=True)),
+                ('content_type', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='contenttypes.ContentType')),
+            ],
+            options={
+                'ordering': ['-date', '-page_id'],
+            },
+        ),
+        migrations.AlterIndexTogether(
+            name='updatefeedentry',
+            index_together=set([('content_type', 'date'), ('homepage_pin', 'homepage_hide', 'date')]),
+        ),
+    ]
@@ -0,0 +1,24 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+import django.contrib.postgres.search
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('home', '0091_updatefeedentry'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='updatefeedentry',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.RunSQL(
+            'CREATE INDEX home_updatefeedentry_search_vector ON home_updatefeedentry USING gin(search_vector);',
+            'DROP INDEX home_updatefeedentry_search_vector;',
+        ),
+    ]
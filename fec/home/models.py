@@ -1,8 +1,14 @@
 import datetime
 import functools
 import logging
+import uuid
 
-from django.db import models
+from collections import OrderedDict
+
+from django.db import models, transaction
+from django.db.models import Case, F, Value, When
+from django.contrib.postgres.fields import JSONField
+from django.contrib.postgres.search import SearchQuery, SearchRank, SearchVector, SearchVectorField
 from django.core.exceptions import ValidationError
 from django.http import HttpResponseRedirect
 
@@ -10,6 +16,10 @@ from django.dispatch import receiver
 from django.db.models.signals import post_save, pre_delete
 from django.contrib.auth.models import User
 from django.contrib.auth import get_user_model
+from django.contrib.contenttypes.models import ContentType
+from django.utils import timezone
+from django.utils.html import strip_tags
+from django.utils.text import Truncator
 
 from audit_log.models.fields import LastUserField
 from audit_log.models.managers import AuditLog
@@ -19,6 +29,7 @@ from modelcluster.contrib.taggit import ClusterTaggableManager
 from taggit.models import TaggedItemBase
 from wagtail.wagtailcore.models import Page, Orderable, PageRevision
 from wagtail.wagtailcore.fields import StreamField
+from wagtail.wagtailcore.signals import page_published, page_unpublished
 from wagtail.wagtailcore import blocks
 from wagtail.wagtailadmin.edit_handlers import (FieldPanel, StreamFieldPanel,
                                                 PageChooserPanel, InlinePanel, MultiFieldPanel)
@@ -36,6 +47,7 @@ from django.db.models.signals import m2m_changed
 from wagtail.contrib.table_block.blocks import TableBlock
 
 from fec import constants
+from home.utils.cache import cached_response, invalidate_models
 
 logger = logging.getLogger(__name__)
 
@@ -185,12 +197,12 @@ def log_user_save(sender, **kwargs):
 @receiver(pre_delete, sender=PageRevision)
 @receiver(post_save, sender=PageRevision)
 def log_revisions(sender, **kwargs):
-    try:
-        user_id = int(kwargs.get('instance').user_id)
-        user = User.objects.get(id=user_id)
-    except User.DoesNotExist:
+    # Revisions saved by scripts and imports have no user
+    user = User.objects.filter(id=kwargs.get('instance').user_id).first()
+    if user is None:
         logger.info("User not found")
-    logger.info("page was modified: {0} by user {1}".format(kwargs.get('instance'), user.get_username()))
+    username = user.get_username() if user else None
+    logger.info("page was modified: {0} by user {1}".format(kwargs.get('instance'), username))
 
 
 def user_groups_changed(sender, **kwargs):
@@ -659,6 +671,15 @@ class DocumentFeedPage(ContentPage):
     def category_filters(self):
         return constants.report_category_groups[self.category]
 
+    def serve(self, request, *args, **kwargs):
+        # The feed is the same for every anonymous visitor with the same filters
+        return cached_response(
+            request,
+            DOCUMENT_FEED_MODELS,
+            lambda: super(DocumentFeedPage, self).serve(request, *args, **kwargs),
+            params=['year', 'category']
+        )
+
 
 class ReportsLandingPage(ContentPage, UniqueModel):
     subpage_types = ['DocumentFeedPage']
@@ -1047,3 +1068,273 @@ class ReportingExamplePage(Page):
     @property
     def content_section(self):
         return 'help'
+
+
+# Publishing any of these changes what a DocumentFeedPage shows
+DOCUMENT_FEED_MODELS = [DocumentFeedPage, DocumentPage, ResourcePage]
+
+
+# Maps the update_type values used by the /updates/ filters to their page models
+UPDATE_FEED_MODELS = OrderedDict([
+    ('press-release', PressReleasePage),
+    ('fec-record', RecordPage),
+    ('weekly-digest', DigestPage),
+    ('tips-for-treasurers', TipsForTreasurersPage),
+    ('meetings', MeetingPage),
+])
+
+
+# The Postgres text search configuration used for the update feed
+SEARCH_CONFIG = 'english'
+
+
+def get_search_vector(page):
+    """
+    Builds a weighted tsvector expression from the search_fields a page already
+    declares (title, body, agenda, imported_html, ...). The title is weighted
+    A, and everything else B.
+    """
+    vector = None
+    for field in page.get_search_fields():
+        if not isinstance(field, index.SearchField):
+            continue
+        value = field.get_value(page)
+        if isinstance(value, (list, tuple)):
+            value = ' '.join(str(item) for item in value)
+        text = strip_tags(str(value or ''))
+        if not text:
+            continue
+        weight = 'A' if field.field_name == 'title' else 'B'
+        field_vector = SearchVector(Value(text, output_field=models.TextField()),
+                                    config=SEARCH_CONFIG, weight=weight)
+        vector = field_vector if vector is None else vector + field_vector
+    return vector
+
+
+def get_excerpt(page):
+    """Plain text of the first paragraph block of a page's body, if it has one"""
+    for block in getattr(page, 'body', None) or []:
+        if block.block_type == 'paragraph':
+            return Truncator(strip_tags(block.value.source)).words(30)
+    return ''
+
+
+def get_entry_values(page):
+    """The fields of a specific update page's UpdateFeedEntry, other than its search_vector"""
+    return {
+        'content_type_id': ContentType.objects.get_for_model(page).id,
+        'update_type': page.get_update_type,
+        'date': page.date,
+        'category': getattr(page, 'category', '') or '',
+        'meeting_type': getattr(page, 'meeting_type', '') or '',
+        'homepage_pin': getattr(page, 'homepage_pin', False),
+        'homepage_pin_start': getattr(page, 'homepage_pin_start', None),
+        'homepage_pin_expiration': getattr(page, 'homepage_pin_expiration', None),
+        'homepage_hide': getattr(page, 'homepage_hide', False),
+        'title': page.title,
+        'formatted_title': getattr(page, 'formatted_title', '') or '',
+        'url': page.url or '',
+        'excerpt': get_excerpt(page),
+    }
+
+
+class UpdateFeedEntryQuerySet(models.QuerySet):
+    def search(self, query, order_by_rank=False):
+        """
+        Full-text search against the GIN-indexed search_vector. Any other
+        filters on the queryset (category, date, ...) go into the same query.
+        Results are annotated with a weighted `rank`.
+        """
+        search_query = SearchQuery(query, config=SEARCH_CONFIG)
+        results = self.filter(search_vector=search_query) \
+            .annotate(rank=SearchRank(F('search_vector'), search_query))
+        if order_by_rank:
+            results = results.order_by('-rank', '-date', '-page_id')
+        return results
+
+
+class UpdateFeedEntry(models.Model):
+    """
+    A denormalized row for every live update page, so the updates feed and the
+    home page news can be filtered and ordered with one indexed query instead
+    of querying each update type and joining wagtailcore_page for `live`.
+
+    It also holds the full-text search vector for those pages, built from
+    their search_fields, so searching the archive is one GIN index lookup.
+
+    Rows are kept current by the page_published/page_unpublished signals below,
+    are added for imported pages by data_loader's bulk_add_children(), are
+    removed along with their page when it's deleted and are filled in or
+    rebuilt with `manage.py rebuild_update_feed`, which is run by hand after
+    the table is first deployed rather than from a migration, since building
+    a row needs the current page models.
+    """
+    page = models.OneToOneField(Page, primary_key=True, on_delete=models.CASCADE, related_name='+')
+    content_type = models.ForeignKey(ContentType, on_delete=models.CASCADE, related_name='+')
+    update_type = models.CharField(max_length=255)
+    date = models.DateField(db_index=True)
+    category = models.CharField(max_length=255, blank=True)
+    meeting_type = models.CharField(max_length=2, blank=True)
+    homepage_pin = models.BooleanField(default=False)
+    homepage_pin_start = models.DateField(blank=True, null=True)
+    homepage_pin_expiration = models.DateField(blank=True, null=True)
+    homepage_hide = models.BooleanField(default=False)
+    title = models.CharField(max_length=255)
+    formatted_title = models.CharField(max_length=255, blank=True)
+    url = models.CharField(max_length=255, blank=True)
+    excerpt = models.TextField(blank=True)
+    search_vector = SearchVectorField(null=True, editable=False)
+
+    objects = UpdateFeedEntryQuerySet.as_manager()
+
+    class Meta:
+        ordering = ['-date', '-page_id']
+        index_together = [
+            ('content_type', 'date'),
+            ('homepage_pin', 'homepage_hide', 'date'),
+        ]
+
+    def __str__(self):
+        return self.title
+
+    @property
+    def get_update_type(self):
+        return self.update_type
+
+    @classmethod
+    def update_for_page(cls, page):
+        """Creates or updates the entry for a live update page"""
+        page = page.specific
+        values = get_entry_values(page)
+        entry, created = cls.objects.update_or_create(page_id=page.id, defaults=values)
+        cls.objects.filter(page_id=page.id).update(search_vector=get_search_vector(page))
+        return entry
+
+    @classmethod
+    def create_for_pages(cls, pages):
+        """
+        Adds entries in bulk for new specific pages that were saved without
+        being published, like the ones the data_loader importers add. Pages
+        that aren't live or aren't updates are skipped.
+        """
+        pages = [page for page in pages if page.live and type(page) in UPDATE_FEED_MODELS.values()]
+        if not pages:
+            return
+        cls.objects.bulk_create([cls(page_id=page.id, **get_entry_values(page)) for page in pages])
+        # Set every vector with one UPDATE, picking each row's with a CASE
+        cls.objects.filter(page_id__in=[page.id for page in pages]).update(search_vector=Case(
+            *[When(page_id=page.id, then=get_search_vector(page)) for page in pages],
+            output_field=SearchVectorField()
+        ))
+        # Without a publish, nothing else invalidates the cached feeds and home page news
+        invalidate_models(type(page) for page in pages)
+
+
+@receiver(page_published)
+def update_feed_entry_on_publish(sender, instance, **kwargs):
+    if sender in UPDATE_FEED_MODELS.values():
+        UpdateFeedEntry.update_for_page(instance)
+
+
+@receiver(page_unpublished)
+def update_feed_entry_on_unpublish(sender, instance, **kwargs):
+    if sender in UPDATE_FEED_MODELS.values():
+        UpdateFeedEntry.objects.filter(page_id=instance.id).delete()
+
+
+@receiver(post_save, sender=Page)
+def update_feed_entries_on_move(sender, instance, **kwargs):
+    """
+    Page.move() saves the moved page as a plain Page and then rewrites the
+    url_paths of its descendants, all in one transaction, so refresh the URLs
+    of any entries at or below it once that's committed
+    """
+    def update_urls():
+        entries = UpdateFeedEntry.objects.filter(page__path__startswith=instance.path).select_related('page')
+        for entry in entries:
+            entry.url = entry.page.url or ''
+            entry.save(update_fields=['url'])
+
+    transaction.on_commit(update_urls)
+
+
+class RADSubmission(models.Model):
+    """
+    A question from the RAD contact form, waiting to be sent to ServiceNow.
+
+    The form view only inserts a row, so visitors don't wait on ServiceNow and
+    a slow or failed request doesn't lose their question. Rows are sent by
+    `manage.py drain_rad_outbox`, which the cms-worker app runs in a loop and
+    which retries failures with exponential backoff.
+
+    Delivery is at least once: a row that reached ServiceNow but wasn't marked
+    as sent, because the response was lost, say, is sent again. Each row's
+    idempotency_key is sent along with it, so the copies can be recognized as
+    one question.
+    """
+    PENDING = 'pending'
+    SENT = 'sent'
+    FAILED = 'failed'
+    STATUS_CHOICES = (
+        (PENDING, 'Pending'),
+        (SENT, 'Sent'),
+        (FAILED, 'Failed'),
+    )
+
+    # Give up on a submission after this many failed attempts
+    MAX_ATTEMPTS = 10
+
+    # Seconds to wait before the first retry, doubling for each one after
+    RETRY_BACKOFF = 30
+    MAX_RETRY_BACKOFF = 60 * 60
+
+    idempotency_key = models.UUIDField(default=uuid.uuid4, unique=True, editable=False)
+    data = JSONField()
+    status = models.CharField(max_length=7, choices=STATUS_CHOICES, default=PENDING)
+    attempts = models.PositiveIntegerField(default=0)
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    sent_at = models.DateTimeField(blank=True, null=True)
+
+    class Meta:
+        ordering = ['next_attempt_at', 'id']
+        index_together = [('status', 'next_attempt_at')]
+
+    def __str__(self):
+        return '{} ({})'.format(self.idempotency_key, self.status)
+
+    @classmethod
+    def due(cls):
+        return cls.objects.filter(status=cls.PENDING, next_attempt_at__lte=timezone.now())
+
+    def claim(self, lease):
+        """
+        Pushes back this row's next attempt by `lease` seconds, so no other
+        drainer picks it up while it's being sent. Returns False if another
+        drainer claimed it first.
+        """
+        next_attempt_at = timezone.now() + datetime.timedelta(seconds=lease)
+        claimed = RADSubmission.objects.filter(
+            pk=self.pk, status=self.PENDING, next_attempt_at=self.next_attempt_at
+        ).update(next_attempt_at=next_attempt_at)
+        self.next_attempt_at = next_attempt_at
+        return bool(claimed)
+
+    def mark_sent(self):
+        self.status = self.SENT
+        self.attempts += 1
+        self.sent_at = timezone.now()
+        self.last_error = ''
+        self.save(update_fields=['status', 'attempts', 'sent_at', 'last_error'])
+
+    def mark_failed(self, error):
+        """Schedules a retry, or gives up after MAX_ATTEMPTS"""
+        self.attempts += 1
+        self.last_error = str(error)
+        if self.attempts >= self.MAX_ATTEMPTS:
+            self.status = self.FAILED
+        else:
+            backoff = min(self.RETRY_BACKOFF * 2 ** (self.attempts - 1), self.MAX_RETRY_BACKOFF)
+            self.next_attempt_at = timezone.now() + datetime.timedelta(seconds=backoff)
+        self.save(update_fields=['status', 'attempts', 'last_error', 'next_attempt_at'])
@@ -3,10 +3,11 @@ import re
 from django import template
 from home.models import CommissionerPage
 from django.db.models import Q
+from home.utils.cache import cached_inclusion_tag
 
 register = template.Library()
 
-@register.inclusion_tag('partials/current-commissioners.html')
+@cached_inclusion_tag(register, 'partials/current-commissioners.html', [CommissionerPage])
 def current_commissioners():
     chair_commissioner = CommissionerPage.objects.filter(commissioner_title__startswith='Chair') \
         .exclude(commissioner_title__contains='Vice').first()
@@ -5,6 +5,7 @@ from operator import attrgetter
 from django.conf import settings
 from home.models import DocumentPage, ResourcePage
 from wagtail.wagtailcore.models import Page, Orderable
+from home.utils.cache import cached_inclusion_tag
 
 register = template.Library()
 
@@ -24,7 +25,8 @@ def get_resource_pages(page, year='', category=''):
 
     return resource_pages
 
-@register.inclusion_tag('partials/document-feed.html')
+@cached_inclusion_tag(register, 'partials/document-feed.html', [DocumentPage, ResourcePage],
+                      request_params=['year', 'category'])
 def document_feed(page, request):
     """
     Queries for all DocumentPages that are childern of the current page
@@ -2,16 +2,22 @@ import re
 
 from django import template
 from django.conf import settings
+from collections import OrderedDict
 from operator import attrgetter
 from itertools import chain, islice
-from datetime import date
+from datetime import date, datetime, time
+from django.contrib.contenttypes.models import ContentType
+from django.db.models import Q
 from home.models import (HomePageBannerAnnouncement, DigestPage, RecordPage, PressReleasePage,
-                        TipsForTreasurersPage, ServicesLandingPage)
+                        TipsForTreasurersPage, ServicesLandingPage, UpdateFeedEntry,
+                        UPDATE_FEED_MODELS)
+from home.utils.cache import LISTING_CACHE_TIMEOUT, cached_inclusion_tag
 
 register = template.Library()
 
 
-@register.inclusion_tag('partials/home-page-banner-announcement.html')
+@cached_inclusion_tag(register, 'partials/home-page-banner-announcement.html',
+                      [HomePageBannerAnnouncement])
 def home_page_banner_announcement():
     banners = HomePageBannerAnnouncement.objects.live().filter(active=True).order_by('-date_active')[:2]
 
@@ -20,34 +26,66 @@ def home_page_banner_announcement():
     }
 
 
-@register.inclusion_tag('partials/home-page-news.html')
-def home_page_news():
-    # get one of each update type (not featured)
-    record = RecordPage.objects.live().filter(homepage_hide=False, homepage_pin=False).order_by('-date')[:1]
-    tips_for_treasurer = TipsForTreasurersPage.objects.live().order_by('-date')[:1]
-    press_release = PressReleasePage.objects.live().filter(homepage_hide=False, homepage_pin=False).order_by('-date')[:1]
-    weekly_digest = DigestPage.objects.live().order_by('-date')[:1]
-
-    # get featured press releases and records
-    press_releases_pinned = PressReleasePage.objects.live().filter(homepage_hide=False, homepage_pin=True, homepage_pin_start__lte=date.today()).order_by('-date')
-    records_pinned = RecordPage.objects.live().filter(homepage_hide=False, homepage_pin=True, homepage_pin_start__lte=date.today()).order_by('-date')
-
-    chained_featured_updates = chain(press_releases_pinned, records_pinned)
-
-    # remove expired featured updates
-    # limit to only one featured update
-    featured_updates = []
-    for update in chained_featured_updates:
-        if update.homepage_pin_expiration:
-            if update.homepage_pin_expiration > date.today():
-                featured_updates.append(update)
-                break
-        else:
-            featured_updates.append(update)
-            break
-
-    updates = islice(chain(featured_updates, record, tips_for_treasurer, press_release, weekly_digest), 4)
+# How many of the newest entries to look through for the latest of each type
+# before falling back to a query per type
+HOME_PAGE_NEWS_WINDOW = 50
+
+
+def get_home_page_news():
+    content_types = ContentType.objects.get_for_models(
+        RecordPage, TipsForTreasurersPage, PressReleasePage, DigestPage)
+    entries = UpdateFeedEntry.objects.filter(homepage_hide=False,
+                                             content_type__in=content_types.values())
+
+    # get one of each update type (not featured) from the newest entries
+    latest = OrderedDict((content_types[model].id, None) for model in
+                         [RecordPage, TipsForTreasurersPage, PressReleasePage, DigestPage])
+    for entry in entries.filter(homepage_pin=False)[:HOME_PAGE_NEWS_WINDOW]:
+        if latest[entry.content_type_id] is None:
+            latest[entry.content_type_id] = entry
+    for content_type_id, entry in latest.items():
+        if entry is None:
+            latest[content_type_id] = entries.filter(homepage_pin=False,
+                                                      content_type_id=content_type_id).first()
+
+    # get featured press releases and records that have started and not expired,
+    # limited to one featured update and preferring press releases
+    featured_updates = entries.filter(homepage_pin=True, homepage_pin_start__lte=date.today()) \
+        .filter(Q(homepage_pin_expiration__isnull=True) | Q(homepage_pin_expiration__gt=date.today()))
+    featured_updates = sorted(
+        featured_updates,
+        key=lambda entry: entry.content_type_id != content_types[PressReleasePage].id
+    )[:1]
+
+    return list(islice(chain(featured_updates, (entry for entry in latest.values() if entry)), 4))
 
+
+def seconds_until_next_pin_change():
+    """
+    Pinned updates start showing on their homepage_pin_start date and stop on
+    their homepage_pin_expiration date. Returns the seconds until the next of
+    those boundaries, or the listing cache timeout if there isn't one sooner.
+    """
+    today = date.today()
+    boundaries = UpdateFeedEntry.objects.filter(homepage_pin=True, homepage_hide=False) \
+        .filter(Q(homepage_pin_start__gt=today) | Q(homepage_pin_expiration__gt=today)) \
+        .values_list('homepage_pin_start', 'homepage_pin_expiration')
+    upcoming = [day for pair in boundaries for day in pair if day and day > today]
+    if not upcoming:
+        return LISTING_CACHE_TIMEOUT
+
+    next_change = datetime.combine(min(upcoming), time.min)
+    seconds = int((next_change - datetime.now()).total_seconds()) + 1
+    return max(1, min(seconds, LISTING_CACHE_TIMEOUT))
+
+
+@cached_inclusion_tag(register, 'partials/home-page-news.html', UPDATE_FEED_MODELS.values(),
+                      timeout=seconds_until_next_pin_change)
+def home_page_news():
+    """
+    The home page news is cached until an update page is published or a pin
+    starts or expires, so rendering the home page doesn't query for it
+    """
     return {
-        'updates': updates
+        'updates': get_home_page_news()
     }
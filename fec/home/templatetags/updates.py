@@ -4,15 +4,16 @@ from django import template
 from django.conf import settings
 from home.models import DigestPage
 from home.models import PressReleasePage
+from home.utils.cache import cached_inclusion_tag
 
 register = template.Library()
 
-@register.inclusion_tag('partials/press-feed.html')
+@cached_inclusion_tag(register, 'partials/press-feed.html', [PressReleasePage])
 def press_releases():
     press_releases = PressReleasePage.objects.live().order_by('-date')[:3]
     return {'updates': press_releases}
 
-@register.inclusion_tag('partials/press-feed.html')
+@cached_inclusion_tag(register, 'partials/press-feed.html', [DigestPage])
 def weekly_digests():
     digests = DigestPage.objects.live().order_by('-date')[:3]
     return {'updates': digests}
@@ -0,0 +1,126 @@
+from datetime import date, timedelta
+from unittest import mock
+
+from django.contrib.auth.models import AnonymousUser
+from django.core.cache import cache
+from django.http import HttpResponse, QueryDict
+from django.template import Context, Template
+from django.test import RequestFactory, TestCase
+
+from home.models import HomePage, RecordPage, TipsForTreasurersPage, UpdateFeedEntry
+from home.templatetags import home_page
+from home.utils import cache as listing_cache
+
+
+class TestListingCache(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.factory = RequestFactory()
+        self.view = mock.Mock(return_value=HttpResponse('updates'))
+        self.cached_view = listing_cache.cache_listing(RecordPage, params=['category'])(self.view)
+
+    def get(self, path):
+        request = self.factory.get(path)
+        request.user = AnonymousUser()
+        return self.cached_view(request)
+
+    def test_normalize_query(self):
+        # It doesn't matter what order the parameters come in
+        self.assertEqual(
+            listing_cache.normalize_query(QueryDict('category=b&year=2017&category=a')),
+            listing_cache.normalize_query(QueryDict('year=2017&category=a&category=b'))
+        )
+
+    def test_cached(self):
+        # It only calls the view once for the same query
+        self.get('/updates/?category=a&category=b')
+        response = self.get('/updates/?category=b&category=a')
+        self.assertEqual(response.content, b'updates')
+        self.assertEqual(self.view.call_count, 1)
+
+        # But does for a different one
+        self.get('/updates/?category=a')
+        self.assertEqual(self.view.call_count, 2)
+
+    def test_other_params(self):
+        # Parameters the view doesn't read share the cached response
+        self.get('/updates/?category=a')
+        self.get('/updates/?category=a&utm_source=email')
+        self.assertEqual(self.view.call_count, 1)
+
+        # And don't add entries of their own
+        self.get('/updates/?utm_source=email')
+        self.get('/updates/?utm_source=tweet')
+        self.assertEqual(self.view.call_count, 3)
+        self.get('/updates/')
+        self.assertEqual(self.view.call_count, 4)
+
+    @mock.patch.object(listing_cache.transaction, 'on_commit')
+    def test_invalidated_on_publish(self, on_commit):
+        # It calls the view again once a publish of a tracked model is committed
+        self.get('/updates/')
+        listing_cache.invalidate_listings(RecordPage)
+        self.get('/updates/')
+        self.assertEqual(self.view.call_count, 1)
+
+        on_commit.call_args[0][0]()
+        self.get('/updates/')
+        self.assertEqual(self.view.call_count, 2)
+
+    @mock.patch.object(listing_cache.transaction, 'on_commit')
+    def test_untracked_page_models(self, on_commit):
+        # It invalidates page models that no cached view in this process uses
+        versions = listing_cache.get_versions([TipsForTreasurersPage])
+        listing_cache.invalidate_listings(TipsForTreasurersPage)
+        on_commit.call_args[0][0]()
+        self.assertNotEqual(listing_cache.get_versions([TipsForTreasurersPage]), versions)
+
+        # But not other models
+        on_commit.reset_mock()
+        listing_cache.invalidate_listings(UpdateFeedEntry)
+        self.assertFalse(on_commit.called)
+
+
+class TestHomePageNews(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_timeout_without_pins(self):
+        self.assertEqual(home_page.seconds_until_next_pin_change(), listing_cache.LISTING_CACHE_TIMEOUT)
+
+    def test_timeout_until_pin_expires(self):
+        # It expires the snapshot when the pin does
+        home = HomePage.objects.get()
+        record = RecordPage(title='Pinned', category='statistics', homepage_pin=True,
+                            homepage_pin_start=date.today(),
+                            homepage_pin_expiration=date.today() + timedelta(days=1))
+        home.add_child(instance=record)
+        record.save_revision().publish()
+        seconds = home_page.seconds_until_next_pin_change()
+        self.assertTrue(0 < seconds <= 24 * 60 * 60 + 1)
+
+    @mock.patch.object(listing_cache.transaction, 'on_commit')
+    def test_invalidated_by_imported_pages(self, on_commit):
+        # Imported pages aren't published, but they're added to the news
+        template = Template('{% load home_page %}{% home_page_news %}')
+        self.assertNotIn('Imported', template.render(Context()))
+
+        record = RecordPage(title='Imported', category='statistics', date=date.today(), live=True)
+        HomePage.objects.get().add_child(instance=record)
+        UpdateFeedEntry.create_for_pages([record])
+        self.assertNotIn('Imported', template.render(Context()))
+
+        on_commit.call_args[0][0]()
+        self.assertIn('Imported', template.render(Context()))
+
+    @mock.patch.object(home_page, 'get_home_page_news', return_value=[])
+    def test_snapshot_cached(self, get_home_page_news):
+        # It doesn't rebuild the news until an update page is published
+        template = Template('{% load home_page %}{% home_page_news %}')
+        template.render(Context())
+        template.render(Context())
+        self.assertEqual(get_home_page_news.call_count, 1)
+
+        listing_cache.bump_version(RecordPage)
+        template.render(Context())
+        self.assertEqual(get_home_page_news.call_count, 2)
@@ -0,0 +1,80 @@
+import time
+
+from unittest import mock
+
+import requests_mock
+
+from django.core.cache import cache
+from django.test import TestCase
+
+from home.utils import jobs_feed
+
+USAJOBS_RESPONSE = {
+    'SearchResult': {
+        'SearchResultItems': [{
+            'MatchedObjectDescriptor': {
+                'PositionTitle': 'Auditor',
+                'PositionID': 'FEC-1',
+                'PositionURI': 'https://www.usajobs.gov/GetJob/ViewDetails/1',
+                'PositionStartDate': '2017-08-01',
+                'PositionEndDate': '2017-09-01',
+                'JobGrade': [{'Code': 'GS'}],
+                'UserArea': {'Details': {
+                    'WhoMayApply': {'Name': 'United States Citizens'},
+                    'LowGrade': '11',
+                    'HighGrade': '13',
+                }},
+            },
+        }],
+    },
+}
+
+
+@mock.patch.object(jobs_feed, 'refresh_in_background')
+class TestGetJobs(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_cold_cache(self, refresh_in_background):
+        # It doesn't wait for USAJOBS when nothing is cached yet
+        self.assertEqual(jobs_feed.get_jobs(), [])
+        refresh_in_background.assert_called_once_with()
+
+    def test_stale_while_revalidate(self, refresh_in_background):
+        # It serves the stale jobs while they're refreshed
+        fetched_at = time.time() - jobs_feed.JOBS_REFRESH_INTERVAL - 1
+        cache.set(jobs_feed.JOBS_KEY, {'jobs': ['stale'], 'fetched_at': fetched_at})
+        self.assertEqual(jobs_feed.get_jobs(), ['stale'])
+        refresh_in_background.assert_called_once_with()
+
+    def test_fresh(self, refresh_in_background):
+        cache.set(jobs_feed.JOBS_KEY, {'jobs': ['fresh'], 'fetched_at': time.time()})
+        self.assertEqual(jobs_feed.get_jobs(), ['fresh'])
+        refresh_in_background.assert_not_called()
+
+
+class TestRefreshJobs(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    @requests_mock.Mocker()
+    def test_refresh(self, mock_request):
+        mock_request.get(jobs_feed.USAJOBS_URL, json=USAJOBS_RESPONSE)
+        jobs = jobs_feed.refresh_jobs()
+        self.assertEqual(jobs[0]['position_title'], 'Auditor')
+        self.assertEqual(jobs[0]['high_grade'], '13')
+        self.assertEqual(cache.get(jobs_feed.JOBS_KEY)['jobs'], jobs)
+
+    @requests_mock.Mocker()
+    def test_circuit_breaker(self, mock_request):
+        # It keeps the last good jobs and stops trying after repeated failures
+        cache.set(jobs_feed.JOBS_KEY, {'jobs': ['last good'], 'fetched_at': 0})
+        mock_request.get(jobs_feed.USAJOBS_URL, status_code=503)
+        for attempt in range(jobs_feed.JOBS_MAX_FAILURES):
+            self.assertIsNone(jobs_feed.refresh_jobs())
+
+        self.assertTrue(cache.get(jobs_feed.CIRCUIT_KEY))
+        self.assertEqual(cache.get(jobs_feed.JOBS_KEY)['jobs'], ['last good'])
+        with mock.patch('threading.Thread') as thread:
+            jobs_feed.refresh_in_background()
+            thread.assert_not_called()
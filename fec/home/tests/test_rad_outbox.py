@@ -0,0 +1,47 @@
+from unittest import mock
+
+import requests_mock
+
+from django.core.management import call_command
+from django.test import TestCase
+from django.utils import timezone
+
+import fec.forms
+from home.models import RADSubmission
+
+
+@mock.patch.object(fec.forms, 'base_url', 'https://servicenow.example.com/api/')
+class TestDrainRADOutbox(TestCase):
+    post_url = 'https://servicenow.example.com/api/u_imp_rad_response'
+
+    def setUp(self):
+        self.submission = RADSubmission.objects.create(data={'u_description': 'Lorem ipsum'})
+
+    @requests_mock.Mocker()
+    def test_sends_submissions(self, mock_request):
+        mock_request.post(self.post_url, status_code=201)
+        call_command('drain_rad_outbox', stdout=mock.Mock())
+
+        self.submission.refresh_from_db()
+        self.assertEqual(self.submission.status, RADSubmission.SENT)
+        # It sends the idempotency key along with the submission
+        self.assertEqual(mock_request.last_request.json(), {
+            'u_description': 'Lorem ipsum',
+            'u_idempotency_key': str(self.submission.idempotency_key),
+        })
+
+    @requests_mock.Mocker()
+    def test_retries_with_backoff(self, mock_request):
+        mock_request.post(self.post_url, status_code=503)
+        call_command('drain_rad_outbox', stdout=mock.Mock())
+
+        self.submission.refresh_from_db()
+        self.assertEqual(self.submission.status, RADSubmission.PENDING)
+        self.assertEqual(self.submission.attempts, 1)
+        self.assertGreater(self.submission.next_attempt_at, timezone.now())
+        self.assertFalse(RADSubmission.due().exists())
+
+    def test_gives_up(self):
+        self.submission.attempts = RADSubmission.MAX_ATTEMPTS - 1
+        self.submission.mark_failed('Service Unavailable')
+        self.assertEqual(self.submission.status, RADSubmission.FAILED)
@@ -0,0 +1,93 @@
+import unittest
+
+from datetime import date
+
+from django.test import TestCase
+
+from home.models import HomePage, RecordPage, UpdateFeedEntry
+from home.utils.update_facets import UpdateFacets
+from home.utils.update_search import search_updates
+from home.utils.update_feed import decode_cursor, encode_cursor
+
+
+class TestCursors(unittest.TestCase):
+    def test_round_trip(self):
+        # It decodes what it encodes
+        cursor = encode_cursor('next', date(1976, 3, 2), 123)
+        self.assertEqual(decode_cursor(cursor), ('next', date(1976, 3, 2), 123))
+
+    def test_invalid_cursor(self):
+        # It starts from the top when the cursor is empty or malformed
+        self.assertEqual(decode_cursor(''), (None, None, None))
+        self.assertEqual(decode_cursor('not-a-cursor'), (None, None, None))
+        self.assertEqual(decode_cursor(None), (None, None, None))
+
+
+class TestUpdateFeedEntry(TestCase):
+    def setUp(self):
+        self.home_page = HomePage.objects.get()
+        self.record = RecordPage(title='Record', category='statistics', date=date(2017, 8, 1))
+        self.home_page.add_child(instance=self.record)
+
+    def test_publish_and_unpublish(self):
+        # It adds an entry when a page is published
+        self.record.save_revision().publish()
+        entry = UpdateFeedEntry.objects.get(page_id=self.record.id)
+        self.assertEqual(entry.date, date(2017, 8, 1))
+        self.assertEqual(entry.category, 'statistics')
+        self.assertEqual(entry.get_update_type, 'FEC Record')
+
+        # It indexes the page for full-text search
+        self.assertEqual(list(UpdateFeedEntry.objects.search('record')), [entry])
+        self.assertEqual(list(UpdateFeedEntry.objects.search('audit')), [])
+
+        # It removes the entry when the page is unpublished
+        self.record.unpublish()
+        self.assertFalse(UpdateFeedEntry.objects.filter(page_id=self.record.id).exists())
+
+
+class TestUpdateFacets(TestCase):
+    def setUp(self):
+        home_page = HomePage.objects.get()
+        for title, category, day in [('A', 'statistics', date(2016, 1, 5)),
+                                     ('B', 'litigation', date(2017, 2, 5)),
+                                     ('C', 'compliance', date(2017, 3, 5))]:
+            record = RecordPage(title=title, category=category, date=day)
+            home_page.add_child(instance=record)
+            record.save_revision().publish()
+
+    def test_filter_multiple_categories(self):
+        # It ORs categories together instead of returning nothing
+        facets = UpdateFacets(update_types=['fec-record'], category_list=['statistics', 'litigation'])
+        self.assertEqual(sorted(e.title for e in facets.filter()), ['A', 'B'])
+
+    def test_filter_year(self):
+        facets = UpdateFacets(update_types=['fec-record'], year='2017')
+        self.assertEqual(sorted(e.title for e in facets.filter()), ['B', 'C'])
+
+    def test_counts(self):
+        # Each facet is counted with every filter but its own
+        facets = UpdateFacets(update_types=['fec-record'], category_list=['litigation'], year='2017')
+        counts = facets.counts()
+        self.assertEqual(counts['update_type'], {'fec-record': 2})
+        self.assertEqual(counts['category'], {'litigation': 1, 'compliance': 1})
+        self.assertEqual(counts['year'], {2017: 1})
+
+
+class TestSearchUpdates(TestCase):
+    def setUp(self):
+        home_page = HomePage.objects.get()
+        self.old = RecordPage(title='Audit of the audit committee', category='compliance', date=date(2010, 1, 1))
+        self.new = RecordPage(title='Statistics', category='statistics', date=date(2017, 1, 1))
+        for record in [self.old, self.new]:
+            home_page.add_child(instance=record)
+            record.save_revision().publish()
+
+    def test_search_across_types(self):
+        # It searches every type in one query, newest first by default
+        results = search_updates('audit')
+        self.assertEqual([e.page_id for e in results], [self.old.id])
+
+    def test_search_within_filters(self):
+        facets = UpdateFacets(update_types=['press-release'])
+        self.assertEqual(list(search_updates('audit', entries=facets.filter())), [])
@@ -29,6 +29,11 @@ class TestViews(TestCase):
     self.assertEqual(resp.status_code, 200)
     self.assertTemplateUsed(resp, 'home/latest_updates.html')
 
+  def test_latest_updates_cursor_json(self):
+    resp = self.client.get('/updates/?cursor=&format=json')
+    self.assertEqual(resp.status_code, 200)
+    self.assertEqual(resp.json(), {'results': [], 'next': None, 'prev': None})
+
   def test_commissioners_page(self):
     resp = self.client.get('/about/leadership-and-structure/commissioners/')
     self.assertEqual(resp.status_code, 200)
@@ -0,0 +1,186 @@
+"""
+Caching for listing views and inclusion tags whose output only changes when
+pages are published.
+
+Each cached response is keyed on the path, the normalized values of the query
+parameters the view reads and a version number for every page model the listing depends on. Publishing,
+unpublishing or deleting a page of one of those models bumps its version, so
+the old entries are never read again and simply expire. The versions live in
+the shared cache, so a publish in one process invalidates the listings that
+every other process has cached.
+"""
+import hashlib
+import time
+
+from functools import wraps
+from urllib.parse import urlencode
+
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Model
+from django.db.models.signals import post_delete
+from django.dispatch import receiver
+from django.http import HttpRequest, QueryDict
+from django.template.loader import render_to_string
+from django.utils.safestring import mark_safe
+from wagtail.wagtailcore.models import Page
+from wagtail.wagtailcore.signals import page_published, page_unpublished
+
+# Cached listings are refreshed at least this often (in seconds)
+LISTING_CACHE_TIMEOUT = 60 * 60
+
+
+def version_key(model):
+    return 'cache-version:{}'.format(model._meta.label_lower)
+
+
+def get_versions(models):
+    """Returns the current cache version of each model"""
+    keys = [version_key(model) for model in models]
+    versions = cache.get_many(keys)
+    for key in keys:
+        if key not in versions:
+            # Start from the time rather than 0, so a version that was evicted
+            # can't come back to match entries cached before it was evicted
+            versions[key] = int(time.time() * 1000)
+            cache.add(key, versions[key], None)
+    return [versions[key] for key in keys]
+
+
+def bump_version(model):
+    """Invalidates everything cached for a model"""
+    key = version_key(model)
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, int(time.time() * 1000), None)
+
+
+def invalidate_models(models):
+    """
+    Bumps the versions of `models` once the current transaction is committed.
+    Bumping them straight away would let a request that comes in before the
+    commit cache what it reads, which is still the old data, under the new
+    versions.
+    """
+    models = set(models)
+    transaction.on_commit(lambda: [bump_version(model) for model in models])
+
+
+def normalize_query(query_dict):
+    """
+    Sorts the query parameters and their values, so ?category=b&category=a
+    and ?category=a&category=b share a cache entry
+    """
+    return urlencode(sorted(
+        (key, value) for key in query_dict for value in query_dict.getlist(key)
+    ))
+
+
+def cache_key(prefix, models, *parts):
+    versions = '.'.join(str(version) for version in get_versions(models))
+    digest = hashlib.md5(':'.join(str(part) for part in parts).encode('utf-8')).hexdigest()
+    return '{}:{}:{}'.format(prefix, versions, digest)
+
+
+def cached_response(request, models, get_response, params=(), timeout=LISTING_CACHE_TIMEOUT):
+    """
+    Returns the cached response for an anonymous GET request, or calls
+    get_response() and caches what it returns if it was successful.
+
+    Only the query parameters in `params` are part of the cache key, so
+    tracking or junk parameters can't fill the cache with copies of the same
+    response. A request with other parameters can still be served from the
+    cache, but its own response isn't cached, since it may show them.
+    """
+    if request.method != 'GET' or request.user.is_authenticated:
+        return get_response()
+
+    query = filtered_query(request.GET, params)
+    key = cache_key('listing', models, request.path, normalize_query(query))
+    response = cache.get(key)
+    if response is None:
+        response = get_response()
+        if response.status_code == 200 and all(param in params for param in request.GET):
+            if hasattr(response, 'render'):
+                response.render()
+            cache.set(key, response, timeout)
+    return response
+
+
+def cache_listing(*models, params=()):
+    """
+    Caches a function view for anonymous visitors until a page of one of
+    `models` is published or unpublished. `params` are the query parameters
+    the view reads.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(request, *args, **kwargs):
+            return cached_response(request, models, lambda: view(request, *args, **kwargs), params=params)
+        return wrapper
+    return decorator
+
+
+def tag_cache_part(value, request_params):
+    """How an inclusion tag argument appears in its cache key"""
+    if isinstance(value, HttpRequest):
+        return normalize_query(filtered_query(value.GET, request_params or []))
+    if isinstance(value, Model):
+        return '{}:{}'.format(value._meta.label_lower, value.pk)
+    return repr(value)
+
+
+def filtered_query(query_dict, params):
+    query = QueryDict('', mutable=True)
+    for param in params:
+        values = query_dict.getlist(param)
+        if values:
+            query.setlist(param, values)
+    return query
+
+
+def cached_inclusion_tag(register, template_name, models, request_params=None,
+                         timeout=LISTING_CACHE_TIMEOUT):
+    """
+    Registers an inclusion tag whose rendered HTML is cached until a page of
+    one of `models` is published, unpublished or deleted.
+
+    The cache key includes the tag's arguments: pages by their ID, and a
+    request by the values of `request_params` in its query string, since
+    those are all of the request that the tag uses. `timeout` may be a
+    function, which is called to work out the timeout each time the tag is
+    rendered again. The decorated function itself is returned unchanged.
+    """
+    def decorator(func):
+        @wraps(func)
+        def render_tag(*args, **kwargs):
+            parts = [func.__module__, func.__name__]
+            parts += [tag_cache_part(arg, request_params) for arg in args]
+            parts += ['{}={}'.format(name, tag_cache_part(kwargs[name], request_params))
+                      for name in sorted(kwargs)]
+            key = cache_key('inclusion-tag', models, *parts)
+
+            html = cache.get(key)
+            if html is None:
+                html = render_to_string(template_name, func(*args, **kwargs))
+                cache.set(key, html, timeout() if callable(timeout) else timeout)
+            return mark_safe(html)
+
+        register.simple_tag(render_tag, name=func.__name__)
+        return func
+    return decorator
+
+
+@receiver(page_published)
+@receiver(page_unpublished)
+@receiver(post_delete)
+def invalidate_listings(sender, **kwargs):
+    """
+    Every page model is bumped, not just the ones passed to cache_listing()
+    and cached_inclusion_tag(), since the process that publishes a page
+    (an admin request, an importer or a worker) may not have loaded the
+    views and template tags that use it.
+    """
+    if issubclass(sender, Page):
+        invalidate_models([sender])
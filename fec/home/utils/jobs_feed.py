@@ -0,0 +1,141 @@
+"""
+The open positions shown in the careers block, fetched from USAJOBS.
+
+Renders never call USAJOBS. They read the last parsed list of jobs from the
+shared cache, and if it is missing or older than JOBS_REFRESH_INTERVAL they
+start a refresh in a background thread and carry on with what they have.
+Only one refresh runs at a time across every worker, each request to
+USAJOBS has a strict timeout, and after JOBS_MAX_FAILURES failures in a row
+refreshes stop for JOBS_CIRCUIT_COOLDOWN seconds so an outage doesn't mean
+a hung request for every render.
+
+The cms-worker app runs `manage.py refresh_jobs --loop`, which refreshes the
+jobs more often than JOBS_REFRESH_INTERVAL, so renders normally find them
+cached and fresh.
+"""
+import logging
+import threading
+import time
+
+import dateutil.parser
+import requests
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection
+
+from fec import http
+
+logger = logging.getLogger(__name__)
+
+USAJOBS_URL = 'https://data.usajobs.gov/api/Search'
+USAJOBS_PARAMS = {'Organization': 'LF00', 'WhoMayApply': 'All'}
+
+# The list of jobs is refreshed when it's older than this (in seconds)
+JOBS_REFRESH_INTERVAL = 15 * 60
+
+# How many refreshes in a row can fail before they stop for a while
+JOBS_MAX_FAILURES = 3
+JOBS_CIRCUIT_COOLDOWN = 10 * 60
+
+# Longest a refresh can hold the lock, in case a worker dies mid-refresh
+JOBS_LOCK_TIMEOUT = 60
+
+JOBS_KEY = 'usajobs:jobs'
+FAILURES_KEY = 'usajobs:failures'
+CIRCUIT_KEY = 'usajobs:circuit-open'
+LOCK_KEY = 'usajobs:refresh-lock'
+
+
+def fetch_jobs():
+    """Requests the open positions from USAJOBS and parses them for jobs.html"""
+    headers = {
+        'authorization-key': settings.USAJOBS_API_KEY,
+        'user-agent': 'jcarroll@fec.gov',
+        'host': 'data.usajobs.gov',
+        'cache-control': 'no-cache',
+    }
+    response = http.get('usajobs', USAJOBS_URL, headers=headers, params=USAJOBS_PARAMS)
+    response.raise_for_status()
+
+    jobs = []
+    for item in response.json()['SearchResult']['SearchResultItems']:
+        job = item['MatchedObjectDescriptor']
+        details = job['UserArea']['Details']
+        jobs.append({
+            'position_title': job['PositionTitle'],
+            'position_id': job['PositionID'],
+            'position_uri': job['PositionURI'],
+            'position_start_date': dateutil.parser.parse(job['PositionStartDate']),
+            'position_end_date': dateutil.parser.parse(job['PositionEndDate']),
+            'who_may_apply': details['WhoMayApply']['Name'],
+            'job_grade': job['JobGrade'][0]['Code'],
+            'low_grade': details['LowGrade'],
+            'high_grade': details['HighGrade'],
+        })
+    return jobs
+
+
+def refresh_jobs():
+    """
+    Fetches the jobs and caches them with no expiry, so there is always a
+    last good list to show. Returns the jobs, or None if the fetch failed.
+    """
+    try:
+        jobs = fetch_jobs()
+    except (requests.RequestException, ValueError, KeyError, IndexError, TypeError):
+        logger.exception('Could not refresh the jobs from USAJOBS')
+        record_failure()
+        return None
+
+    cache.set(JOBS_KEY, {'jobs': jobs, 'fetched_at': time.time()}, None)
+    cache.delete(FAILURES_KEY)
+    return jobs
+
+
+def record_failure():
+    cache.add(FAILURES_KEY, 0, None)
+    try:
+        failures = cache.incr(FAILURES_KEY)
+    except ValueError:
+        failures = 1
+    if failures >= JOBS_MAX_FAILURES:
+        logger.warning('Not refreshing the jobs from USAJOBS for %s seconds', JOBS_CIRCUIT_COOLDOWN)
+        cache.set(CIRCUIT_KEY, True, JOBS_CIRCUIT_COOLDOWN)
+        cache.delete(FAILURES_KEY)
+
+
+def is_stale(cached):
+    return cached is None or time.time() - cached['fetched_at'] > JOBS_REFRESH_INTERVAL
+
+
+def refresh_in_background():
+    """
+    Starts a refresh in a background thread unless the circuit is open or
+    another worker is already refreshing
+    """
+    if cache.get(CIRCUIT_KEY) or not cache.add(LOCK_KEY, True, JOBS_LOCK_TIMEOUT):
+        return
+
+    def refresh():
+        try:
+            refresh_jobs()
+        finally:
+            cache.delete(LOCK_KEY)
+            # The cache is in the database, so the thread has a connection
+            connection.close()
+
+    thread = threading.Thread(target=refresh, name='refresh-jobs')
+    thread.daemon = True
+    thread.start()
+
+
+def get_jobs():
+    """
+    Returns the cached jobs straight away, starting a refresh if they're stale.
+    Before the first refresh has finished there are no jobs to show.
+    """
+    cached = cache.get(JOBS_KEY)
+    if is_stale(cached):
+        refresh_in_background()
+    return cached['jobs'] if cached else []
@@ -0,0 +1,124 @@
+from collections import Counter
+from datetime import date
+
+from django.contrib.contenttypes.models import ContentType
+from django.db.models import Count, Q
+from django.db.models.functions import ExtractYear
+
+from home.models import UPDATE_FEED_MODELS, UpdateFeedEntry
+
+# The column that the `category` filter applies to for each update type.
+# Digests and tips don't have categories.
+CATEGORY_FIELDS = {
+    'fec-record': 'category',
+    'press-release': 'category',
+    'meetings': 'meeting_type',
+}
+
+
+def year_range(year):
+    """
+    The first and last day of a year, for filtering with one range predicate.
+    Filtering with the built-in date__year lookup doesn't work when chaining
+    filter() and search(), so this is used with date__gte and date__lte
+    """
+    year = int(year)
+    return date(year, 1, 1), date(year, 12, 31)
+
+
+class UpdateFacets(object):
+    """
+    Turns the update_type, category and year filters of the updates feed into
+    predicates on the UpdateFeedEntry table, and counts what each filter
+    option would return.
+
+    Each requested type becomes one content type predicate with an IN on its
+    category column, the types are ORed together, and the year is one range.
+    Counts come from a single GROUP BY over (type, category, year), and the
+    filters are applied to those rows in Python so each facet is counted with
+    every filter but its own.
+    """
+    def __init__(self, update_types=None, category_list=None, year=None):
+        self.requested_types = bool(update_types)
+        self.update_types = [t for t in update_types or [] if t in UPDATE_FEED_MODELS]
+        self.category_list = [c for c in category_list or [] if c]
+        self.year = int(year) if year else None
+
+        content_types = ContentType.objects.get_for_models(*UPDATE_FEED_MODELS.values())
+        self.content_types = {
+            update_type: content_types[model].id
+            for update_type, model in UPDATE_FEED_MODELS.items()
+        }
+        self.update_types_by_id = {
+            content_type_id: update_type
+            for update_type, content_type_id in self.content_types.items()
+        }
+
+    def type_predicate(self, update_type):
+        predicate = Q(content_type_id=self.content_types[update_type])
+        field = CATEGORY_FIELDS.get(update_type)
+        if field and self.category_list:
+            predicate &= Q(**{field + '__in': self.category_list})
+        return predicate
+
+    def filter(self, entries=None):
+        """Applies the filters to a queryset of UpdateFeedEntry rows"""
+        if entries is None:
+            entries = UpdateFeedEntry.objects.all()
+
+        if self.requested_types:
+            if not self.update_types:
+                return entries.none()
+            predicate = Q()
+            for update_type in self.update_types:
+                predicate |= self.type_predicate(update_type)
+            entries = entries.filter(predicate)
+
+        if self.year:
+            start, end = year_range(self.year)
+            entries = entries.filter(date__gte=start, date__lte=end)
+
+        return entries
+
+    def matches_type(self, update_type, category, use_categories=True):
+        if not self.requested_types:
+            return True
+        if update_type not in self.update_types:
+            return False
+        if use_categories and update_type in CATEGORY_FIELDS and self.category_list:
+            return category in self.category_list
+        return True
+
+    def matches_year(self, year):
+        return not self.year or year == self.year
+
+    def counts(self):
+        """
+        Returns {'update_type': {...}, 'category': {...}, 'year': {...}},
+        each mapping a filter value to the number of live updates it matches
+        """
+        rows = UpdateFeedEntry.objects.annotate(year=ExtractYear('date')) \
+            .values('content_type', 'category', 'meeting_type', 'year') \
+            .annotate(count=Count('page')) \
+            .order_by()
+
+        counts = {
+            'update_type': Counter(),
+            'category': Counter(),
+            'year': Counter(),
+        }
+        for row in rows:
+            update_type = self.update_types_by_id.get(row['content_type'])
+            if update_type is None:
+                continue
+            field = CATEGORY_FIELDS.get(update_type)
+            category = row[field] if field else ''
+
+            if self.matches_year(row['year']):
+                counts['update_type'][update_type] += row['count']
+                if category and self.matches_type(update_type, category, use_categories=False):
+                    counts['category'][category] += row['count']
+            if self.matches_type(update_type, category):
+                counts['year'][row['year']] += row['count']
+
+        return {facet: dict(values) for facet, values in counts.items()}
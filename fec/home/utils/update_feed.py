@@ -0,0 +1,88 @@
+import base64
+import binascii
+
+from datetime import datetime
+
+from django.db.models import Q
+from wagtail.wagtailcore.models import Page
+
+
+def specific_pages(entries):
+    """
+    Swaps a list of UpdateFeedEntry rows for their specific pages, in order,
+    with one query per page type
+    """
+    page_ids = [entry.page_id for entry in entries]
+    pages = Page.objects.filter(id__in=page_ids).specific()
+    pages_by_id = {page.id: page for page in pages}
+    return [pages_by_id[page_id] for page_id in page_ids if page_id in pages_by_id]
+
+
+class CursorPage(object):
+    """
+    One page of UpdateFeedEntry rows found by keyset pagination on
+    (date, page_id), with tokens for the pages on either side of it.
+
+    Unlike offset pagination, the database can seek straight to the cursor
+    with the (date, page_id) ordering, so page 500 costs the same as page 1.
+    """
+    def __init__(self, entries, cursor=None, per_page=20):
+        direction, date, page_id = decode_cursor(cursor)
+        self.per_page = per_page
+
+        if direction == 'prev':
+            rows = list(entries.filter(Q(date__gt=date) | Q(date=date, page_id__gt=page_id))
+                        .order_by('date', 'page_id')[:per_page + 1])
+            more = len(rows) > per_page
+            self.object_list = list(reversed(rows[:per_page]))
+            self._has_previous, self._has_next = more, True
+        else:
+            if direction == 'next':
+                entries = entries.filter(Q(date__lt=date) | Q(date=date, page_id__lt=page_id))
+            rows = list(entries.order_by('-date', '-page_id')[:per_page + 1])
+            more = len(rows) > per_page
+            self.object_list = rows[:per_page]
+            self._has_previous, self._has_next = direction == 'next', more
+
+        # Work out the tokens now, so object_list can be swapped for pages later
+        self.next_cursor = None
+        self.previous_cursor = None
+        if self.object_list:
+            first, last = self.object_list[0], self.object_list[-1]
+            if self._has_next:
+                self.next_cursor = encode_cursor('next', last.date, last.page_id)
+            if self._has_previous:
+                self.previous_cursor = encode_cursor('prev', first.date, first.page_id)
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def has_next(self):
+        return self.next_cursor is not None
+
+    def has_previous(self):
+        return self.previous_cursor is not None
+
+
+def encode_cursor(direction, date, page_id):
+    """Encodes a position in the feed as an opaque, URL-safe token"""
+    value = '{}:{}:{}'.format(direction, date.isoformat(), page_id)
+    return base64.urlsafe_b64encode(value.encode('utf-8')).decode('ascii')
+
+
+def decode_cursor(cursor):
+    """
+    Decodes a token from encode_cursor into (direction, date, page_id).
+    A missing or malformed token starts from the top of the feed.
+    """
+    try:
+        value = base64.urlsafe_b64decode(cursor.encode('ascii')).decode('utf-8')
+        direction, date, page_id = value.split(':')
+        if direction not in ['next', 'prev']:
+            raise ValueError(direction)
+        return direction, datetime.strptime(date, '%Y-%m-%d').date(), int(page_id)
+    except (AttributeError, TypeError, ValueError, binascii.Error):
+        return None, None, None
@@ -0,0 +1,22 @@
+from home.models import UpdateFeedEntry
+
+SORT_OPTIONS = ['date', 'relevance']
+
+
+def search_updates(query, entries=None, sort='date'):
+    """
+    The one search entry point for the updates feed. It searches every update
+    type at once in a single query on the UpdateFeedEntry table, which has a
+    row for every live update page, so relevance is comparable across types.
+
+    :arg str query: The search terms
+    :arg entries: An UpdateFeedEntry queryset to search within, e.g. one
+        filtered by UpdateFacets. Defaults to every entry.
+    :arg str sort: "date" for newest first, or "relevance" for the weighted
+        rank, newest first within the same rank
+    :returns: An UpdateFeedEntry queryset annotated with `rank`. Pass a page
+        of it to specific_pages() to load the pages with one query per type.
+    """
+    if entries is None:
+        entries = UpdateFeedEntry.objects.all()
+    return entries.search(query, order_by_rank=sort == 'relevance')
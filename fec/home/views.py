@@ -1,25 +1,19 @@
 import requests
-from datetime import datetime
 
 from django.shortcuts import render
 from django.core.paginator import Paginator, EmptyPage, PageNotAnInteger
 from django.conf import settings
-from itertools import chain
-from operator import attrgetter
 
-from django.http import HttpResponseRedirect
+from django.http import HttpResponseRedirect, JsonResponse
 from django.shortcuts import get_object_or_404
 from wagtail.wagtaildocs.models import Document
 
 from fec.forms import ContactRAD, form_categories
-from home.models import (
-    CommissionerPage,
-    DigestPage,
-    PressReleasePage,
-    RecordPage,
-    TipsForTreasurersPage,
-    MeetingPage
-)
+from home.utils.cache import cache_listing
+from home.utils.update_facets import UpdateFacets
+from home.utils.update_feed import CursorPage, specific_pages
+from home.utils.update_search import SORT_OPTIONS, search_updates
+from home.models import UPDATE_FEED_MODELS, CommissionerPage
 
 
 def replace_dash(string):
@@ -30,153 +24,66 @@ def replace_space(string):
     return string.replace(' ', '-')
 
 
-def get_records(category_list=None, year=None, search=None):
-    records = RecordPage.objects.live()
-
-    if category_list:
-        for category in category_list:
-            records = records.filter(category=category)
-
-    if year:
-        year = int(year)
-        records = records.filter(date__gte=datetime(year, 1, 1)).filter(date__lte=datetime(year, 12, 31))
-
-    if search:
-        records = records.search(search)
-
-    return records
-
-
-def get_digests(year=None, search=None):
-    digests = DigestPage.objects.live()
-    if year:
-        year = int(year)
-        digests = digests.filter(date__gte=datetime(year, 1, 1)).filter(date__lte=datetime(year, 12, 31))
-
-    if search:
-        digests = digests.search(search)
-
-    return digests
-
-
-def get_press_releases(category_list=None, year=None, search=None):
-    press_releases = PressReleasePage.objects.live()
-
-    if category_list:
-        for category in category_list:
-            press_releases = press_releases.filter(category=category)
-
-    if year:
-        year = int(year)
-        press_releases = press_releases.filter(date__gte=datetime(year, 1, 1)).filter(date__lte=datetime(year, 12, 31))
-
-    if search:
-        press_releases = press_releases.search(search)
-
-    return press_releases
-
-
-def get_tips(year=None, search=None):
-    tips = TipsForTreasurersPage.objects.live()
-
-    if year:
-        year = int(year)
-        tips = tips.filter(date__gte=datetime(year, 1, 1)).filter(date__lte=datetime(year, 12, 31))
-
-    if search:
-        tips = tips.search(search)
-
-    return tips
-
-
-def get_meetings(category_list=None, year=False, search=None):
-    meetings = MeetingPage.objects.live()
-
-    if category_list:
-        for category in category_list:
-            meetings = meetings.filter(meeting_type=category)
-
-    if year:
-        year = int(year)
-        meetings = meetings.filter(date__gte=datetime(year, 1, 1)).filter(date__lte=datetime(year, 12, 31))
-
-    if search:
-        meetings = meetings.search(search)
-
-    return meetings
+def cursor_page_json(updates):
+    """Serializes a CursorPage of UpdateFeedEntry rows for the JSON feed"""
+    return {
+        'results': [
+            {
+                'title': entry.title,
+                'url': entry.url,
+                'date': entry.date.isoformat(),
+                'update_type': entry.update_type,
+                'category': entry.category or entry.meeting_type,
+                'excerpt': entry.excerpt,
+            }
+            for entry in updates
+        ],
+        'next': updates.next_cursor,
+        'prev': updates.previous_cursor,
+    }
 
 
+@cache_listing(*UPDATE_FEED_MODELS.values(), params=[
+    'update_type', 'category', 'year', 'search', 'sort', 'cursor', 'format', 'page'])
 def updates(request):
-    digests = ''
-    records = ''
-    press_releases = ''
-    tips = ''
-    meetings = ''
-
     # Get values from query
     update_types = request.GET.getlist('update_type', None)
     category_list = request.GET.getlist('category', '')
     year = request.GET.get('year', '')
     search = request.GET.get('search', '')
+    sort = request.GET.get('sort', 'date')
+    cursor = request.GET.get('cursor', None)
+
+    if sort not in SORT_OPTIONS:
+        sort = 'date'
 
     category_list = list(map(replace_dash, category_list))
 
-    # If there's a query, only get the types in the query
-    if update_types:
-        if 'fec-record' in update_types:
-            records = get_records(category_list=category_list, year=year, search=search)
-        if 'press-release' in update_types:
-            press_releases = get_press_releases(category_list=category_list,
-                                                year=year, search=search)
-        if 'weekly-digest' in update_types:
-            digests = get_digests(year=year, search=search)
-        if 'tips-for-treasurers' in update_types:
-            tips = get_tips(year=year, search=search)
-        if 'meetings' in update_types:
-            meetings = get_meetings(category_list=category_list, year=year, search=search)
+    # Every live update page has a row in the feed table, so filtering and
+    # searching across all the types is one query
+    facets = UpdateFacets(update_types=update_types, category_list=category_list, year=year)
+    updates = facets.filter()
+    if search:
+        updates = search_updates(search, entries=updates, sort=sort)
 
+    if cursor is not None and sort == 'date':
+        # Opt-in keyset pagination for "load more" and deep links into the archive
+        updates = CursorPage(updates, cursor=cursor, per_page=20)
+        if request.GET.get('format') == 'json':
+            return JsonResponse(cursor_page_json(updates))
     else:
-        # Get everything and filter by year if necessary
-        digests = DigestPage.objects.live()
-        press_releases = PressReleasePage.objects.live()
-        records = RecordPage.objects.live()
-        tips = TipsForTreasurersPage.objects.live()
-        meetings = MeetingPage.objects.live()
-
-        if year:
-            # Trying to filter using the built-in date__year parameter doesn't
-            # work when chaining filter() and search(), so this uses date_gte and date_lte
-            year = int(year)
-            press_releases = press_releases.filter(date__gte=datetime(year, 1, 1)).filter(date__lte=datetime(year, 12, 31))
-            digests = digests.filter(date__gte=datetime(year, 1, 1)).filter(date__lte=datetime(year, 12, 31))
-            records = records.filter(date__gte=datetime(year, 1, 1)).filter(date__lte=datetime(year, 12, 31))
-            tips = tips.filter(date__gte=datetime(year, 1, 1)).filter(date__lte=datetime(year, 12, 31))
-            meetings = meetings.filter(date__gte=datetime(year, 1, 1)).filter(date__lte=datetime(year, 12, 31))
-
-        if search:
-            press_releases = press_releases.search(search)
-            digests = digests.search(search)
-            records = records.search(search)
-            tips = tips.search(search)
-            meetings = meetings.search(search)
-
-    # Chain all the QuerySets together
-    # via http://stackoverflow.com/a/434755/1864981
-    updates = sorted(
-      chain(press_releases, digests, records, tips, meetings),
-      key=attrgetter('date'),
-      reverse=True
-    )
-
-    # Handle pagination
-    page = request.GET.get('page', 1)
-    paginator = Paginator(updates, 20)
-    try:
-        updates = paginator.page(page)
-    except PageNotAnInteger:
-        updates = paginator.page(1)
-    except EmptyPage:
-        updates = paginator.page(paginator.num_pages)
+        cursor = None
+        # Handle pagination
+        page = request.GET.get('page', 1)
+        paginator = Paginator(updates, 20)
+        try:
+            updates = paginator.page(page)
+        except PageNotAnInteger:
+            updates = paginator.page(1)
+        except EmptyPage:
+            updates = paginator.page(paginator.num_pages)
+
+    updates.object_list = specific_pages(updates.object_list)
 
     page_context = {
       'title': 'Latest updates',
@@ -190,7 +97,11 @@ def updates(request):
         'update_types': update_types,
         'updates': updates,
         'year': year,
-        'search': search
+        'search': search,
+        'sort': sort,
+        'cursor': cursor,
+        # Facet counts don't account for the search terms
+        'facets': facets.counts() if not search else None
     })
 
 
@@ -215,6 +126,7 @@ def contact(request):
     })
 
 
+@cache_listing(CommissionerPage)
 def commissioners(request):
     chair_commissioner = CommissionerPage.objects.filter(commissioner_title__contains='Chair') \
       .exclude(commissioner_title__contains='Vice').first()
@@ -263,8 +175,7 @@ def contact_rad(request):
         # If it's a POST, post to the ServiceNow API
         if request.method == 'POST':
             form = ContactRAD(request.POST)
-            response = form.post_to_service_now()
-            if response == 201:
+            if form.queue_for_service_now():
                 return render(request, 'home/contact-form.html', {
                   'self': page_context,
                   'success': True
@@ -2,7 +2,8 @@ from wagtail.contrib.modeladmin.options import ModelAdmin, modeladmin_register
 from wagtail.wagtailcore import hooks
 
 from .models import Author
-from search.utils.search_indexing import handle_page_edit_or_create, handle_page_delete
+from search.utils import local_search
+from search.utils.search_indexing import queue_page_update, queue_page_delete
 
 class AuthorAdmin(ModelAdmin):
     model = Author
@@ -19,14 +20,17 @@ modeladmin_register(AuthorAdmin)
 
 @hooks.register('after_create_page')
 def search_add(request, page):
-    handle_page_edit_or_create(page, 'add')
+    queue_page_update(page)
+    local_search.update_page(page)
 
 
 @hooks.register('after_edit_page')
 def search_update(request, page):
-    handle_page_edit_or_create(page, 'update')
+    queue_page_update(page)
+    local_search.update_page(page)
 
 
 @hooks.register('after_delete_page')
 def remove_page(request, page):
-    handle_page_delete(page.id)
+    queue_page_delete(page.id)
+    local_search.remove_page(page.id)
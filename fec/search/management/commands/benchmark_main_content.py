@@ -0,0 +1,78 @@
+import os
+import timeit
+
+from bs4 import BeautifulSoup
+
+from django.core.management import BaseCommand
+from django.conf import settings
+
+from search.utils import main_content
+
+SAMPLES_DIR = os.path.join(settings.REPO_DIR, 'fec/search/management/data/samples')
+
+# The selectors for each sample page, and the find_all() calls the scrapers
+# made with BeautifulSoup before they used search.utils.main_content
+LAYOUTS = {
+    'cms_page.html': (
+        main_content.CMS_CONTENT,
+        [('article', {'class_': 'main'}), ('section', {'class_': 'main__content--right'})],
+    ),
+    'transition_page.html': (
+        main_content.TRANSITION_CONTENT,
+        [('div', {'id': 'fec_mainContentWide'}), ('div', {'id': 'fec_mainContent'})],
+    ),
+    'web_app_page.html': (
+        main_content.WEB_APP_CONTENT,
+        [('main', {'id': 'main'})],
+    ),
+}
+
+
+def soup_text(html, finds):
+    """How the scrapers used to get the text of a page"""
+    soup = BeautifulSoup(html, 'lxml')
+    text = ''
+
+    for name, attrs in finds:
+        content = soup.find_all(name, **attrs)
+        if content:
+            break
+
+    for tag in content:
+        text = text + tag.get_text().replace('\n', ' ')
+
+    return text
+
+
+class Command(BaseCommand):
+    help = 'Times extracting the main content of the sample pages with lxml against BeautifulSoup'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--repeat',
+            type=int,
+            default=200,
+            help='How many times to extract each page'
+        )
+
+    def handle(self, *args, **options):
+        repeat = options['repeat']
+        total_soup = total_lxml = 0
+
+        for file_name in sorted(LAYOUTS):
+            selectors, finds = LAYOUTS[file_name]
+            with open(os.path.join(SAMPLES_DIR, file_name), 'r') as sample:
+                html = sample.read()
+
+            # Both should find the same words, give or take whitespace
+            if soup_text(html, finds).split() != main_content.extract_text(html, selectors).split():
+                self.stderr.write('The text of {} does not match'.format(file_name))
+
+            soup_time = timeit.timeit(lambda: soup_text(html, finds), number=repeat)
+            lxml_time = timeit.timeit(lambda: main_content.extract_text(html, selectors), number=repeat)
+            total_soup += soup_time
+            total_lxml += lxml_time
+            self.stdout.write('{}: BeautifulSoup {:.2f}ms, lxml {:.2f}ms, {:.1f}x faster'.format(
+                file_name, soup_time / repeat * 1000, lxml_time / repeat * 1000, soup_time / lxml_time))
+
+        self.stdout.write(self.style.SUCCESS('Overall {:.1f}x faster'.format(total_soup / total_lxml)))
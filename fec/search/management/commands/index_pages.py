@@ -1,18 +1,68 @@
 import json
 import os
+import threading
+import time
+
+from concurrent import futures
+
 import requests
-from bs4 import BeautifulSoup
 
 from django.conf import settings
 from django.core.management import BaseCommand
 
-from home.models import Page
+from fec import http
 
 
 DIGITALGOV_DRAWER_KEY_TRANSITION = settings.FEC_DIGITALGOV_DRAWER_KEY_TRANSITION
 drawer = settings.DIGITALGOV_DRAWER_HANDLE
 key = settings.FEC_DIGITALGOV_DRAWER_KEY_MAIN
 
+I14Y_DOCUMENTS_URL = 'https://i14y.usa.gov/api/v1/documents'
+
+
+class RateLimiter(object):
+    """Spaces out calls across threads so there are at most `rate` a second"""
+    def __init__(self, rate):
+        self.interval = 1.0 / rate if rate else 0
+        self.next_call = time.time()
+        self.lock = threading.Lock()
+
+    def wait(self):
+        with self.lock:
+            now = time.time()
+            wait = self.next_call - now
+            self.next_call = max(now, self.next_call) + self.interval
+        if wait > 0:
+            time.sleep(wait)
+
+
+def read_documents(json_file):
+    """
+    Yields the documents in a JSON Lines file, one per line, as written by
+    scrape_cms_pages, or in a file with one JSON array of them
+    """
+    first = json_file.read(1)
+    while first.isspace():
+        first = json_file.read(1)
+    json_file.seek(0)
+
+    if first == '[':
+        yield from json.load(json_file)
+    else:
+        for line in json_file:
+            if line.strip():
+                yield json.loads(line)
+
+
+def percentile(values, percent):
+    """The nearest-rank percentile of a list of numbers"""
+    if not values:
+        return 0
+    values = sorted(values)
+    index = max(int(round(percent / 100.0 * len(values))) - 1, 0)
+    return values[index]
+
+
 class Command(BaseCommand):
     help = 'Indexes pages'
 
@@ -29,50 +79,151 @@ class Command(BaseCommand):
             help="Add this flag to add to the transition drawer"
         )
 
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=4,
+            help='How many documents to send at once'
+        )
+
+        parser.add_argument(
+            '--rate',
+            type=float,
+            default=10,
+            help='Most requests to send to i14y a second, 0 for no limit'
+        )
+
+        parser.add_argument(
+            '--checkpoint',
+            type=str,
+            help='File of the document IDs already sent, which a rerun skips. '
+                 'Defaults to the JSON file path with .done on the end'
+        )
+
+        parser.add_argument(
+            '--restart',
+            action='store_true',
+            help='Ignore the checkpoint file and send every document again'
+        )
+
     def handle(self, *args, **options):
         self.stdout.write(self.style.WARNING('Indexing pages'))
 
         # If we're putting in the transition drawer, use those creds
         if options['transition']:
-            drawer = 'transition'
-            key = DIGITALGOV_DRAWER_KEY_TRANSITION
+            self.auth = ('transition', DIGITALGOV_DRAWER_KEY_TRANSITION)
+        else:
+            self.auth = (drawer, key)
 
         if options['json_file_path']:
             file_name = options['json_file_path']
         else:
             file_name = os.path.join(settings.REPO_DIR, 'fec/search/management/data/output.json')
 
+        checkpoint = options['checkpoint'] or file_name + '.done'
+        done = set() if options['restart'] else self.read_checkpoint(checkpoint)
+        self.limiter = RateLimiter(options['rate'])
+
         with open(file_name, 'r') as json_contents:
             if options['verbosity'] > 1:
                 self.stdout.write((options['json_file_path']))
 
-            pages = json.load(json_contents)
-            for page in pages:
-                self.add(page)
+            pages = read_documents(json_contents)
+            self.send_pages(pages, done, checkpoint, options['workers'], 'w' if options['restart'] else 'a')
 
         self.stdout.write(self.style.SUCCESS('All done'))
 
+    def read_checkpoint(self, checkpoint):
+        if not os.path.exists(checkpoint):
+            return set()
+        with open(checkpoint, 'r') as done_file:
+            return {line.strip() for line in done_file if line.strip()}
+
+    def send_pages(self, pages, done, checkpoint, workers, mode):
+        """
+        Sends the pages that aren't in `done` with a pool of workers, adding
+        each document ID to the checkpoint file as soon as it's been saved.
+        Only a couple of pages per worker are read ahead of the ones being
+        sent, so memory use doesn't grow with the size of the file.
+        """
+        start = time.time()
+        self.latencies = []
+        self.failed = []
+        self.sent = 0
+        skipped = 0
+
+        with open(checkpoint, mode) as done_file, futures.ThreadPoolExecutor(max_workers=workers) as executor:
+            running = {}
+            for page in pages:
+                if str(page['document_id']) in done:
+                    skipped += 1
+                    continue
+                if len(running) >= workers * 2:
+                    finished, not_done = futures.wait(running, return_when=futures.FIRST_COMPLETED)
+                    for future in finished:
+                        self.finish(future, running.pop(future), done_file)
+                running[executor.submit(self.add, page)] = page
+
+            for future in futures.as_completed(running):
+                self.finish(future, running[future], done_file)
+
+        elapsed = time.time() - start
+        self.stdout.write('Sent {} documents, {} failed and {} already sent, in {:.1f}s'.format(
+            self.sent, len(self.failed), skipped, elapsed))
+        self.stdout.write('Latency p50 {:.0f}ms, p90 {:.0f}ms, p99 {:.0f}ms'.format(
+            *(percentile(self.latencies, p) * 1000 for p in (50, 90, 99))))
+        if self.failed:
+            self.stdout.write('Failed: {}'.format(', '.join(str(document_id) for document_id in self.failed)))
+
+    def finish(self, future, page, done_file):
+        """Records the result of sending a page"""
+        try:
+            saved, latency = future.result()
+        except requests.RequestException as error:
+            self.stdout.write('Could not send {}: {}'.format(page['document_id'], error))
+            saved, latency = False, None
+
+        if latency is not None:
+            self.latencies.append(latency)
+        if saved:
+            self.sent += 1
+            done_file.write('{}\n'.format(page['document_id']))
+            done_file.flush()
+        else:
+            self.failed.append(page['document_id'])
+
+    def request(self, method, url, page):
+        self.limiter.wait()
+        start = time.time()
+        r = http.request('i14y', method, url, auth=self.auth, data=page)
+        return r, time.time() - start
+
     def add(self, page):
-        r = requests.post("https://i14y.usa.gov/api/v1/documents", auth=(drawer, key), data=page)
+        """Returns whether the document was saved and how long that took"""
+        r, latency = self.request('POST', I14Y_DOCUMENTS_URL, page)
         # A 422 means the page already exists,
         if r.status_code == 422:
             self.stdout.write('{} already exists'.format(page['document_id']))
-            self.update(page)
+            saved, update_latency = self.update(page)
+            return saved, latency + update_latency
         elif r.status_code == 201:
             self.stdout.write('Created {}'.format(page['document_id']))
+            return True, latency
         else:
-            self.stdout.write('Could not create {}'.format(page['document_id']))
-            print(r.__dict__)
+            self.stdout.write('Could not create {}: {}'.format(page['document_id'], r.status_code))
+            return False, latency
 
     def update(self, page):
-        url = "https://i14y.usa.gov/api/v1/documents/{}".format(page.get('document_id'))
-        r = requests.put(url, auth=(drawer, key), data=page)
+        url = '{}/{}'.format(I14Y_DOCUMENTS_URL, page.get('document_id'))
+        r, latency = self.request('PUT', url, page)
         if r.status_code == 200:
             self.stdout.write('Updated {}'.format(page['document_id']))
+            return True, latency
         else:
-            self.stdout.write('Could not update {}'.format(page['document_id']))
-            print(r.__dict__)
+            self.stdout.write('Could not update {}: {}'.format(page['document_id'], r.status_code))
+            return False, latency
 
     def delete(self, page):
         self.stdout.write('Deleting {}'.format(page['document_id']))
-        requests.delete("https://i14y.usa.gov/api/v1/documents", auth=(drawer, key), data=page)
+        self.limiter.wait()
+        http.delete('i14y', I14Y_DOCUMENTS_URL, auth=self.auth, data=page)
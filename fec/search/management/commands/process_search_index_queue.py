@@ -0,0 +1,76 @@
+import datetime
+import time
+
+from django.core.management import BaseCommand
+from django.utils import timezone
+
+from wagtail.wagtailcore.models import Page
+
+from search.models import SearchIndexJob
+from search.utils.search_indexing import handle_page_delete, handle_page_edit_or_create
+
+# Give up on a job after this many failed attempts
+MAX_ATTEMPTS = 5
+
+# Seconds to wait before the first retry, doubling for each one after
+RETRY_BACKOFF = 60
+
+
+class Command(BaseCommand):
+    help = 'Sends the page changes queued by the page hooks to the DigitalGov search index'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--loop',
+            action='store_true',
+            help='Keep working through the queue instead of stopping once it is empty'
+        )
+        parser.add_argument(
+            '--interval',
+            type=int,
+            default=10,
+            help='Seconds to wait between polls of an empty queue with --loop'
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            processed = self.process_queue()
+            if processed:
+                self.stdout.write('Processed {} jobs'.format(processed))
+            if not options['loop']:
+                break
+            if not processed:
+                time.sleep(options['interval'])
+
+    def process_queue(self):
+        processed = 0
+        for job in SearchIndexJob.due():
+            if not job.claim():
+                continue
+            try:
+                self.run(job)
+            except Exception as error:
+                self.retry(job, error)
+            processed += 1
+        return processed
+
+    def run(self, job):
+        page = Page.objects.filter(id=job.page_id).first()
+        if job.action == SearchIndexJob.DELETE or page is None:
+            handle_page_delete(job.page_id)
+        else:
+            handle_page_edit_or_create(page, 'update')
+
+    def retry(self, job, error):
+        """Queues a failed job again with backoff, unless the page was edited since"""
+        attempts = job.attempts + 1
+        if attempts >= MAX_ATTEMPTS:
+            self.stderr.write('Giving up on job {}: {}'.format(job, error))
+            return
+        backoff = RETRY_BACKOFF * 2 ** (attempts - 1)
+        SearchIndexJob.objects.get_or_create(page_id=job.page_id, defaults={
+            'action': job.action,
+            'attempts': attempts,
+            'run_after': timezone.now() + datetime.timedelta(seconds=backoff),
+        })
+        self.stderr.write('Job {} failed, retrying in {}s: {}'.format(job, backoff, error))
@@ -0,0 +1,20 @@
+from django.core.management import BaseCommand
+from django.db import transaction
+
+from search.models import SitePage
+from search.utils.local_search import indexed_pages, update_page
+
+
+class Command(BaseCommand):
+    help = 'Rebuilds the local site search index that backs up DigitalGov search'
+
+    def handle(self, *args, **options):
+        self.stdout.write(self.style.WARNING('Rebuilding the local site search index...'))
+
+        with transaction.atomic():
+            SitePage.objects.all().delete()
+            pages = indexed_pages()
+            for page in pages:
+                update_page(page)
+
+        self.stdout.write(self.style.SUCCESS('Indexed {} pages'.format(len(pages))))
@@ -1,11 +1,15 @@
 import json
 import os
+
+from concurrent import futures
+
 import requests
-from bs4 import BeautifulSoup
 
 from django.core.management import BaseCommand
 from django.conf import settings
 
+from fec import http
+
 from home.models import Page
 from home.models import (
     CommissionerPage,
@@ -15,7 +19,8 @@ from home.models import (
     TipsForTreasurersPage
 )
 
-from fec import constants
+from search.utils import main_content
+from search.utils.local_search import indexed_pages
 
 BASE_URL = settings.CANONICAL_BASE
 
@@ -43,11 +48,22 @@ class Command(BaseCommand):
 
         parser.add_argument(
             '-no-content',
-            type=bool,
-            default=False,
+            action='store_true',
             help='Don\'t scrape the content of the page'
         )
 
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=4,
+            help='How many pages to fetch at once'
+        )
+
+        parser.add_argument(
+            '--output',
+            type=str,
+            help='Path of the JSON Lines file to write, defaults to data/output.json'
+        )
 
     def handle(self, *args, **options):
         self.stdout.write(self.style.WARNING('Getting pages...'))
@@ -63,59 +79,75 @@ class Command(BaseCommand):
             pages = Page.objects.child_of(parent).live().public()
         else:
             # If no specific pages were requested, just get them all
-            pages = []
-            # Get all the pages that are descendants of pages
-            for p in constants.SEARCH_DESCENDANTS_OF:
-                parent = Page.objects.live().public().get(url_path=p)
-                pages += Page.objects.descendant_of(parent).live().public()
-            # Get all the pages that are direct children of pages
-            for p in constants.SEARCH_CHILDREN_OF:
-                parent = Page.objects.live().public().get(url_path=p)
-                pages += Page.objects.child_of(parent).live().public()
-
-        extracted = []
-
-        for page in pages:
-            p = {
-              "document_id": page.id,
-              "title": page.title,
-              "path": BASE_URL + page.url,
-              "created": page.first_published_at.strftime("%Y-%m-%d-%H%M%S"),
-              "promote": "false",
-              "language": "en",
-            }
-
-            if 'no-content' not in options:
-              content = self.get_content(page.url)
-              if content:
-                  p["content"] = content
-
-            extracted.append(p)
-
-        self.write_articles(extracted)
+            pages = indexed_pages()
+
+        if options['output']:
+            fname = options['output']
+        else:
+            fname = os.path.join(settings.REPO_DIR, 'fec/search/management/data/output.json')
+
+        if not isinstance(pages, list):
+            pages = pages.iterator()
+
+        self.stdout.write('Writing to ' + fname)
+        with open(fname, 'w') as f:
+            count = self.write_articles(pages, f, options['workers'], not options['no_content'])
+        self.stdout.write(self.style.SUCCESS('Wrote {} pages'.format(count)))
+
+    def extract(self, page):
+        return {
+          "document_id": page.id,
+          "title": page.title,
+          "path": BASE_URL + page.url,
+          "created": page.first_published_at.strftime("%Y-%m-%d-%H%M%S"),
+          "promote": "false",
+          "language": "en",
+        }
+
+    def write_articles(self, pages, f, workers, with_content):
+        """
+        Writes a JSON line for each page as soon as its content has been
+        fetched. The pages are read from the database here, and only the
+        requests for their content go to the workers, with a couple of pages
+        per worker queued at a time.
+        """
+        count = 0
+        with futures.ThreadPoolExecutor(max_workers=workers) as executor:
+            running = {}
+            for page in pages:
+                p = self.extract(page)
+                if not with_content:
+                    self.write_line(f, p)
+                    count += 1
+                    continue
+                if len(running) >= workers * 2:
+                    finished, not_done = futures.wait(running, return_when=futures.FIRST_COMPLETED)
+                    for future in finished:
+                        self.finish(future, running.pop(future), f)
+                        count += 1
+                running[executor.submit(self.get_content, page.url)] = p
+
+            for future in futures.as_completed(running):
+                self.finish(future, running[future], f)
+                count += 1
+        return count
+
+    def finish(self, future, p, f):
+        try:
+            content = future.result()
+        except requests.RequestException as error:
+            self.stderr.write('Could not get content for {}: {}'.format(p['path'], error))
+            content = None
+        if content:
+            p["content"] = content
+        self.write_line(f, p)
+
+    def write_line(self, f, p):
+        f.write(json.dumps(p) + '\n')
+        f.flush()
 
     def get_content(self, url):
         url = BASE_URL + url
-        r  = requests.get(url)
+        r = http.get('fec-web', url)
         self.stdout.write('Getting content for ' + url)
-        data = r.text
-        soup = BeautifulSoup(data, 'lxml')
-        text = ''
-
-        # First look for an article. If that's not there, look for this section
-        article = soup.find_all('article', class_="main")
-        if not article:
-            main = soup.find_all('section', class_="main__content--right")
-
-        content = article if article else main
-
-        for tag in content:
-            text = text + tag.get_text().replace('\n', ' ')
-
-        return text
-
-    def write_articles(self, pages, **options):
-        self.stdout.write('Writing to file')
-        fname = os.path.join(settings.REPO_DIR, 'fec/search/management/data/output.json')
-        with open(fname, "w+") as f:
-            json.dump(pages, f, indent=4)
+        return main_content.extract_text(r.text, main_content.CMS_CONTENT)
@@ -1,11 +1,12 @@
 import json
 import os
-import requests
-from bs4 import BeautifulSoup
 
 from django.core.management import BaseCommand
 from django.conf import settings
 
+from fec import http
+from search.utils import main_content
+
 BASE_URL = 'https://transition.fec.gov'
 
 
@@ -68,21 +69,9 @@ class Command(BaseCommand):
         Looks specifically for #fec_mainContentWide or #fec_mainContent,
         the main IDs of the body content areas on these pages.
         """
-        r  = requests.get(url)
+        r = http.get('fec-web', url)
         self.stdout.write('Getting content for ' + url)
-        data = r.text
-        soup = BeautifulSoup(data, 'lxml')
-        text = ''
-
-        mainContentWide = soup.find_all('div', id='fec_mainContentWide')
-        if not mainContentWide:
-            mainContent = soup.find_all('div', id='fec_mainContent')
-        content = mainContentWide if mainContentWide else mainContent
-
-        for tag in content:
-            text = text + tag.get_text().replace('\n', ' ')
-
-        return text
+        return main_content.extract_text(r.text, main_content.TRANSITION_CONTENT)
 
     def write_articles(self, pages, **options):
         """Write the extracted data to a file"""
@@ -1,11 +1,12 @@
 import json
 import os
-import requests
-from bs4 import BeautifulSoup
 
 from django.core.management import BaseCommand
 from django.conf import settings
 
+from fec import http
+from search.utils import main_content
+
 BASE_URL = settings.CANONICAL_BASE
 
 
@@ -71,18 +72,9 @@ class Command(BaseCommand):
         Scrapes the text content from a given URL.
         Looks specifically for #main
         """
-        r  = requests.get(url)
+        r = http.get('fec-web', url)
         self.stdout.write('Getting content for ' + url)
-        data = r.text
-        soup = BeautifulSoup(data, 'lxml')
-        text = ''
-
-        main = soup.find_all('main', id='main')
-
-        for tag in main:
-            text = text + tag.get_text().replace('\n', ' ')
-
-        return text
+        return main_content.extract_text(r.text, main_content.WEB_APP_CONTENT)
 
     def write_articles(self, pages, **options):
         """Write the extracted data to a file"""
@@ -0,0 +1,118 @@
+import time
+
+from collections import Counter
+
+import requests
+
+from django.core.management import BaseCommand
+
+from wagtail.wagtailcore.models import Page
+
+from fec import http
+from search.models import IndexedDocument, document_hash
+from search.utils.local_search import indexed_pages
+from search.utils.search_indexing import create_search_index_doc, delete_document, push_document
+
+# How many changed pages to load at a time, with one query per page type
+SPECIFIC_BATCH_SIZE = 200
+
+
+class Command(BaseCommand):
+    help = 'Sends the pages that changed since the last sync to the i14y index and removes the ones that are gone'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--force',
+            action='store_true',
+            help='Send every page, even the ones that haven\'t changed'
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Only count what would be sent and deleted'
+        )
+
+    def handle(self, *args, **options):
+        self.stdout.write(self.style.WARNING('Syncing the search index...'))
+        start = time.time()
+        requests_before = self.request_count()
+
+        self.counts = Counter()
+        self.force = options['force']
+        self.dry_run = options['dry_run']
+
+        documents = IndexedDocument.objects.in_bulk()
+        pages = list(indexed_pages())
+        changed = [page.id for page in pages if self.may_have_changed(page, documents.get(page.id))]
+        self.counts['unchanged'] += len(pages) - len(changed)
+        for offset in range(0, len(changed), SPECIFIC_BATCH_SIZE):
+            batch = changed[offset:offset + SPECIFIC_BATCH_SIZE]
+            for page in Page.objects.filter(id__in=batch).specific():
+                self.sync_page(page, documents.get(page.id))
+
+        live_ids = {page.id for page in pages}
+        for page_id in sorted(set(documents) - live_ids):
+            self.delete(page_id)
+
+        elapsed = time.time() - start
+        sent = self.request_count() - requests_before
+        for name in ['created', 'updated', 'unchanged', 'deleted', 'failed']:
+            self.stdout.write('{}: {}'.format(name.capitalize(), self.counts[name]))
+        self.stdout.write('Checked {} pages and sent {} requests in {:.1f}s ({:.1f} pages/s)'.format(
+            len(pages), sent, elapsed, len(pages) / elapsed if elapsed else 0))
+        self.stdout.write(self.style.SUCCESS('All done'))
+
+    def request_count(self):
+        return http.stats().get('i14y', {}).get('requests', 0)
+
+    def may_have_changed(self, page, indexed):
+        """
+        Whether a page needs its document built and compared: it's new, has a
+        new revision or has moved since it was last sent
+        """
+        return (
+            self.force or
+            indexed is None or
+            indexed.revision_created_at != page.latest_revision_created_at or
+            indexed.url_path != page.url_path
+        )
+
+    def sync_page(self, page, indexed):
+        """Sends a specific page if it's new or what would be indexed has changed"""
+        document = create_search_index_doc(page)
+        if indexed and not self.force and indexed.content_hash == document_hash(document):
+            # A new revision or move that didn't change the document
+            if not self.dry_run:
+                indexed.revision_created_at = page.latest_revision_created_at
+                indexed.url_path = page.url_path
+                indexed.save(update_fields=['revision_created_at', 'url_path'])
+            self.counts['unchanged'] += 1
+            return
+
+        result = 'updated' if indexed else 'created'
+        if not self.dry_run:
+            try:
+                saved = push_document(document, exists=indexed is not None)
+            except requests.RequestException:
+                saved = False
+            if not saved:
+                self.stderr.write('Could not send page {}'.format(page.id))
+                result = 'failed'
+            else:
+                IndexedDocument.record(page, document)
+        self.counts[result] += 1
+
+    def delete(self, page_id):
+        """Removes a page that's no longer live, public and in a section we index"""
+        if not self.dry_run:
+            try:
+                status_code = delete_document(page_id).status_code
+            except requests.RequestException:
+                status_code = None
+            # A 404 means it was already gone
+            if status_code not in (200, 404):
+                self.stderr.write('Could not delete page {}'.format(page_id))
+                self.counts['failed'] += 1
+                return
+            IndexedDocument.objects.filter(page_id=page_id).delete()
+        self.counts['deleted'] += 1
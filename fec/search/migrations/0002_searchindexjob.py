@@ -0,0 +1,28 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('search', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SearchIndexJob',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('page_id', models.IntegerField(unique=True)),
+                ('action', models.CharField(choices=[('index', 'Index'), ('delete', 'Delete')], max_length=6)),
+                ('run_after', models.DateTimeField(db_index=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('attempts', models.PositiveIntegerField(default=0)),
+            ],
+            options={
+                'ordering': ['run_after', 'id'],
+            },
+        ),
+    ]
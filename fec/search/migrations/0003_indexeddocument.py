@@ -0,0 +1,23 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('search', '0002_searchindexjob'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='IndexedDocument',
+            fields=[
+                ('page_id', models.IntegerField(primary_key=True, serialize=False)),
+                ('content_hash', models.CharField(max_length=64)),
+                ('revision_created_at', models.DateTimeField(blank=True, null=True)),
+                ('pushed_at', models.DateTimeField()),
+            ],
+        ),
+    ]
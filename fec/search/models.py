@@ -0,0 +1,177 @@
+import datetime
+import hashlib
+import json
+
+from django.contrib.postgres.search import SearchQuery, SearchRank, SearchVector, SearchVectorField
+from django.db import IntegrityError, models, transaction
+from django.db.models import F, Func, Value
+from django.utils import timezone
+
+from wagtail.wagtailcore.models import Page
+
+SEARCH_CONFIG = 'english'
+
+# Wraps matches in the same markers as DigitalGov search results, so the
+# highlight_matches filter works on both
+HEADLINE_OPTIONS = 'StartSel=\ue000, StopSel=\ue001, MaxFragments=2, MinWords=10, MaxWords=30'
+
+
+class Headline(Func):
+    """Postgres ts_headline(), for highlighting the matches in a snippet"""
+    function = 'ts_headline'
+    output_field = models.TextField()
+
+    def __init__(self, expression, query, options=HEADLINE_OPTIONS):
+        super().__init__(Value(SEARCH_CONFIG), expression, query, Value(options))
+
+
+class SitePageQuerySet(models.QuerySet):
+    def search(self, query):
+        """
+        Full-text search against the GIN-indexed search_vector, best matches
+        first, annotated with `rank`, a highlighted `headline` of the title and
+        a highlighted `snippet` of the content
+        """
+        search_query = SearchQuery(query, config=SEARCH_CONFIG)
+        return self.filter(search_vector=search_query) \
+            .annotate(
+                rank=SearchRank(F('search_vector'), search_query),
+                headline=Headline(F('title'), search_query, options='HighlightAll=TRUE, ' + HEADLINE_OPTIONS),
+                snippet=Headline(F('content'), search_query),
+            ) \
+            .order_by('-rank', 'page_id')
+
+
+class SitePage(models.Model):
+    """
+    The text of a live, public page in a section of the site that we index,
+    for searching the site when DigitalGov search is slow or down.
+
+    Rows are kept current by the page hooks in home/wagtail_hooks.py and can
+    be rebuilt with `manage.py rebuild_site_search`.
+    """
+    page = models.OneToOneField(Page, primary_key=True, on_delete=models.CASCADE, related_name='+')
+    title = models.CharField(max_length=255)
+    url = models.CharField(max_length=255)
+    content = models.TextField(blank=True)
+    search_vector = SearchVectorField(null=True, editable=False)
+
+    objects = SitePageQuerySet.as_manager()
+
+    def __str__(self):
+        return self.title
+
+    @classmethod
+    def update_for_page(cls, page, url, content):
+        """Creates or updates the row for a page and its search vector"""
+        entry, created = cls.objects.update_or_create(
+            page_id=page.id,
+            defaults={'title': page.title, 'url': url, 'content': content},
+        )
+        cls.objects.filter(page_id=page.id).update(
+            search_vector=SearchVector('title', weight='A', config=SEARCH_CONFIG) +
+            SearchVector('content', weight='B', config=SEARCH_CONFIG)
+        )
+        return entry
+
+
+class SearchIndexJob(models.Model):
+    """
+    A page waiting to be sent to or deleted from the DigitalGov search index.
+
+    The page hooks queue a job instead of talking to i14y while the editor
+    waits, and `manage.py process_search_index_queue`, run in a loop by the
+    cms-worker app, works through them.
+    There's at most one job per page: editing a page again before its job has
+    run only changes the action, so a burst of edits becomes one update.
+    """
+    INDEX = 'index'
+    DELETE = 'delete'
+    ACTION_CHOICES = (
+        (INDEX, 'Index'),
+        (DELETE, 'Delete'),
+    )
+
+    # Seconds to wait for more edits of a page before indexing it
+    COALESCE_WINDOW = 60
+
+    page_id = models.IntegerField(unique=True)
+    action = models.CharField(max_length=6, choices=ACTION_CHOICES)
+    run_after = models.DateTimeField(db_index=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    attempts = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        ordering = ['run_after', 'id']
+
+    def __str__(self):
+        return '{} page {}'.format(self.action, self.page_id)
+
+    @classmethod
+    def enqueue(cls, page_id, action):
+        """
+        Queues an action for a page, or changes the action of its queued job
+        without moving it back, so it still runs at the end of the first edit's
+        window
+        """
+        while True:
+            updated = cls.objects.filter(page_id=page_id).update(action=action, updated_at=timezone.now())
+            if updated:
+                return
+            run_after = timezone.now() + datetime.timedelta(seconds=cls.COALESCE_WINDOW)
+            try:
+                with transaction.atomic():
+                    cls.objects.create(page_id=page_id, action=action, run_after=run_after)
+                return
+            except IntegrityError:
+                # Another request queued a job for the page first
+                continue
+
+    @classmethod
+    def due(cls):
+        return cls.objects.filter(run_after__lte=timezone.now())
+
+    def claim(self):
+        """
+        Removes the job from the queue to run it. Returns False if it was
+        changed by another edit or claimed by another worker since it was read.
+        """
+        deleted, counts = SearchIndexJob.objects.filter(
+            pk=self.pk, action=self.action, updated_at=self.updated_at).delete()
+        return bool(deleted)
+
+
+class IndexedDocument(models.Model):
+    """
+    What was last sent to the i14y index for a page, so sync_search_index
+    only sends pages that have changed since.
+
+    The content hash covers the whole document apart from its `changed`
+    date, so a new revision that doesn't change what's indexed isn't sent
+    again. The page's url_path is kept too, since moving a page changes its
+    path in the index without a new revision. Rows outlive their pages, so documents for pages that have been
+    deleted can be found and removed from the index.
+    """
+    page_id = models.IntegerField(primary_key=True)
+    content_hash = models.CharField(max_length=64)
+    revision_created_at = models.DateTimeField(null=True, blank=True)
+    url_path = models.TextField(blank=True, default='')
+    pushed_at = models.DateTimeField()
+
+    def __str__(self):
+        return 'page {}'.format(self.page_id)
+
+    @classmethod
+    def record(cls, page, document):
+        cls.objects.update_or_create(page_id=page.id, defaults={
+            'content_hash': document_hash(document),
+            'revision_created_at': page.latest_revision_created_at,
+            'url_path': page.url_path,
+            'pushed_at': timezone.now(),
+        })
+
+
+def document_hash(document):
+    """A hash of an i14y document, ignoring the date it was last changed"""
+    content = {key: value for key, value in document.items() if key != 'changed'}
+    return hashlib.sha256(json.dumps(content, sort_keys=True).encode('utf-8')).hexdigest()
@@ -0,0 +1,73 @@
+import json
+import os
+import re
+import shutil
+import tempfile
+
+import requests_mock
+
+from unittest import mock
+
+from django.core.management import call_command
+from django.test import TestCase
+
+from search.management.commands.index_pages import percentile, read_documents
+
+documents_url = re.compile('https://i14y.usa.gov/api/v1/documents')
+
+
+class TestIndexPages(TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.file_name = os.path.join(self.directory, 'output.json')
+        with open(self.file_name, 'w') as json_file:
+            json.dump([{'document_id': 1, 'title': 'One'}, {'document_id': 2, 'title': 'Two'}], json_file)
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def index_pages(self, *args):
+        call_command('index_pages', '--json_file_path', self.file_name, '--rate', '0', *args, stdout=mock.Mock())
+
+    @requests_mock.Mocker()
+    def test_resume(self, m):
+        # It skips the documents that were sent last time
+        m.register_uri('POST', documents_url, [{'status_code': 201}, {'status_code': 500}])
+        self.index_pages('--workers', '1')
+        with open(self.file_name + '.done') as done_file:
+            self.assertEqual(done_file.read(), '1\n')
+
+        sent = len(m.request_history)
+        m.register_uri('POST', documents_url, status_code=201)
+        self.index_pages()
+        resent = m.request_history[sent:]
+        self.assertEqual(len(resent), 1)
+        self.assertEqual(resent[0].body, 'document_id=2&title=Two')
+
+    @requests_mock.Mocker()
+    def test_existing_document(self, m):
+        # It updates documents that are already in the index
+        m.register_uri('POST', documents_url, status_code=422)
+        m.register_uri('PUT', documents_url, status_code=200)
+        self.index_pages()
+        with open(self.file_name + '.done') as done_file:
+            self.assertEqual(sorted(done_file.read().split()), ['1', '2'])
+
+    @requests_mock.Mocker()
+    def test_json_lines(self, m):
+        # It reads the JSON Lines that scrape_cms_pages writes
+        with open(self.file_name, 'w') as json_file:
+            json_file.write('{"document_id": 3, "title": "Three"}\n\n{"document_id": 4, "title": "Four"}\n')
+        m.register_uri('POST', documents_url, status_code=201)
+        self.index_pages()
+        with open(self.file_name + '.done') as done_file:
+            self.assertEqual(sorted(done_file.read().split()), ['3', '4'])
+
+    def test_read_documents(self):
+        with open(self.file_name) as json_file:
+            self.assertEqual([page['document_id'] for page in read_documents(json_file)], [1, 2])
+
+    def test_percentile(self):
+        self.assertEqual(percentile([3, 1, 2, 4], 50), 2)
+        self.assertEqual(percentile([3, 1, 2, 4], 99), 4)
+        self.assertEqual(percentile([], 50), 0)
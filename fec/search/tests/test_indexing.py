@@ -1,11 +1,20 @@
+import requests
 import requests_mock
 import search.utils.search_indexing as search
 
+from search.utils import indexability
+
 from wagtail.wagtailcore.models import Page
 from unittest import mock
 from django.test import Client, TestCase, override_settings
 from django.conf import settings
-from datetime import datetime
+from django.core.cache import cache
+from django.core.management import call_command
+from django.utils import timezone
+from datetime import date, datetime
+
+from home.models import HomePage, RecordPage
+from search.models import IndexedDocument, SearchIndexJob
 
 # Only use the real search engine if we're on production
 if settings.FEC_CMS_ENVIRONMENT == 'PRODUCTION':
@@ -28,23 +37,17 @@ class MockPage(object):
     search_description = None
     latest_revision_created_at = None
 
-    def __init__(self, add_description=False, add_latest_revision=False, parent_path='/home/about/', ancestor_path='/home/'):
-        self.parent_path = parent_path
-        self.ancestor_path = ancestor_path
+    def __init__(self, add_description=False, add_latest_revision=False, path='00010005', depth=2):
+        self.path = path
+        self.depth = depth
         if add_description:
             self.search_description = 'Fake description'
         if add_latest_revision:
             self.latest_revision_created_at = datetime(2017, 6, 2, 0, 0)
 
-    def get_parent(self):
-        return MockParent(self.parent_path)
-
-    def get_ancestors(self):
-        return [MockParent(self.parent_path), MockParent(self.ancestor_path)]
 
-class MockParent(object):
-    def __init__(self, path):
-        self.url_path = path
+# The paths and depths of the pages whose descendants and whose children are indexed
+INDEX_ROOTS = ([('00010002', 2)], [('0001', 1)])
 
 
 # Override settings so the env will be treated as prod but we'll send to a nonexistent API url
@@ -52,7 +55,7 @@ class MockParent(object):
     FEC_CMS_ENVIRONMENT='PRODUCTION',
     DIGITALGOV_BASE_URL='http://localhost:3000',
     CANONICAL_BASE='https://www.fec.gov')
-@mock.patch.object(search, 'scrape_page_content')
+@mock.patch.object(search, 'get_page_text')
 class TestSearchIndexing(TestCase):
     def setUp(self):
         self.page = MockPage()
@@ -71,8 +74,8 @@ class TestSearchIndexing(TestCase):
           'language': 'en',
         })
 
-        # It calls scrape_page_content with the correct url
-        scrape.assert_called_with('https://www.fec.gov/mock/')
+        # It gets the content from the page itself
+        scrape.assert_called_with(self.page)
 
     def test_create_index_doc_with_description(self, scrape):
         # It adds description if the page has one
@@ -88,12 +91,15 @@ class TestSearchIndexing(TestCase):
         self.assertEqual(doc['changed'], '2017-06-02-000000')
 
 
+    @mock.patch.object(IndexedDocument, 'record')
     @requests_mock.Mocker()
-    def test_add_document(self, scrape, m):
+    def test_add_document(self, record, scrape, m):
         # It makes a POST to the add endpoint
+        scrape.return_value = 'Page text'
         m.register_uri('POST', 'http://localhost:3000/documents', status_code=201)
         search.add_document(self.page)
         self.assertTrue(m.called)
+        record.assert_called_once_with(self.page, mock.ANY)
 
 
     @mock.patch.object(search, 'update_document')
@@ -106,11 +112,22 @@ class TestSearchIndexing(TestCase):
 
 
     @requests_mock.Mocker()
-    def test_update_document(self, scrape, m):
+    def test_add_document_failure(self, scrape, m):
+        # It raises if i14y doesn't accept the document, so the job is retried
+        m.register_uri('POST', 'http://localhost:3000/documents', status_code=500)
+        with self.assertRaises(requests.HTTPError):
+            search.add_document(self.page)
+
+
+    @mock.patch.object(IndexedDocument, 'record')
+    @requests_mock.Mocker()
+    def test_update_document(self, record, scrape, m):
         # It makes a PUT to the update endpoint
+        scrape.return_value = 'Page text'
         m.register_uri('PUT', 'http://localhost:3000/documents/123', status_code=200)
         search.update_document(self.page)
         self.assertTrue(m.called)
+        record.assert_called_once_with(self.page, mock.ANY)
 
 
     @requests_mock.Mocker()
@@ -121,6 +138,14 @@ class TestSearchIndexing(TestCase):
         self.assertTrue(m.called)
 
 
+    @requests_mock.Mocker()
+    def test_delete_document_failure(self, scrape, m):
+        # It raises if the document couldn't be deleted
+        m.register_uri('DELETE', 'http://localhost:3000/documents/123', status_code=503)
+        with self.assertRaises(requests.HTTPError):
+            search.handle_page_delete(123)
+
+
     @override_settings(FEC_CMS_ENVIRONMENT='LOCAL')
     @requests_mock.Mocker()
     def test_delete_document_off_prod(self, scrape, m):
@@ -173,21 +198,126 @@ class TestSearchIndexing(TestCase):
         self.assertFalse(add.called)
 
 
-    def test_check_ancestors_valid_parent(self, scrape):
+    @mock.patch.object(indexability, 'get_index_roots', return_value=INDEX_ROOTS)
+    def test_check_ancestors_valid_parent(self, roots, scrape):
         # check_ancestors returns the page when it has a valid direct parent
         p = search.check_ancestors(self.page)
         self.assertEqual(p, self.page)
 
 
-    def test_check_ancestors_valid_ancestors(self, scrape):
+    @mock.patch.object(indexability, 'get_index_roots', return_value=INDEX_ROOTS)
+    def test_check_ancestors_valid_ancestors(self, roots, scrape):
         # check_ancestors returns the page when it has valid ancestors
-        page = MockPage(parent_path='/home/legal-resources/something/', ancestor_path='/home/legal-resources/')
+        page = MockPage(path='0001000200030004', depth=4)
         p = search.check_ancestors(page)
         self.assertEqual(p, page)
 
 
-    def test_check_ancestors_invalid_ancestors(self, scrape):
+    @mock.patch.object(indexability, 'get_index_roots', return_value=INDEX_ROOTS)
+    def test_check_ancestors_invalid_ancestors(self, roots, scrape):
         # check_ancestors returns None when it has an invalid parent and ancestors
-        page = MockPage(parent_path='/fake/', ancestor_path='/fake/fake/')
+        page = MockPage(path='0001000300040005', depth=4)
         p = search.check_ancestors(page)
         self.assertEqual(p, None)
+
+        # Or when it's a grandchild of a page whose children are indexed
+        page = MockPage(path='000100010002', depth=3)
+        p = search.check_ancestors(page)
+        self.assertEqual(p, None)
+
+
+@override_settings(FEC_CMS_ENVIRONMENT='PRODUCTION')
+class TestSearchIndexQueue(TestCase):
+    def test_coalesce_edits(self):
+        # Repeated edits of a page make one job
+        page = MockPage()
+        search.queue_page_update(page)
+        search.queue_page_update(page)
+        self.assertEqual(SearchIndexJob.objects.count(), 1)
+
+        # The latest action wins
+        search.queue_page_delete(page.id)
+        job = SearchIndexJob.objects.get()
+        self.assertEqual(job.action, SearchIndexJob.DELETE)
+
+    def test_process_queue(self):
+        SearchIndexJob.enqueue(123, SearchIndexJob.DELETE)
+        SearchIndexJob.objects.update(run_after=timezone.now())
+        with mock.patch('search.management.commands.process_search_index_queue.handle_page_delete') as handle:
+            call_command('process_search_index_queue', stdout=mock.Mock())
+            handle.assert_called_once_with(123)
+        self.assertFalse(SearchIndexJob.objects.exists())
+
+    @requests_mock.Mocker()
+    def test_retry_failed_job(self, m):
+        # A job that i14y rejects is queued again with backoff
+        m.register_uri('DELETE', 'http://localhost:3000/documents/123', status_code=500)
+        SearchIndexJob.enqueue(123, SearchIndexJob.DELETE)
+        SearchIndexJob.objects.update(run_after=timezone.now())
+        call_command('process_search_index_queue', stdout=mock.Mock(), stderr=mock.Mock())
+        job = SearchIndexJob.objects.get()
+        self.assertEqual(job.attempts, 1)
+        self.assertGreater(job.run_after, timezone.now())
+
+    def test_claim_after_edit(self):
+        # A job edited since it was read isn't claimed
+        SearchIndexJob.enqueue(123, SearchIndexJob.INDEX)
+        job = SearchIndexJob.objects.get()
+        SearchIndexJob.enqueue(123, SearchIndexJob.DELETE)
+        self.assertFalse(job.claim())
+
+
+@mock.patch('search.management.commands.sync_search_index.push_document', return_value=True)
+class TestSyncSearchIndex(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.page = RecordPage(title='Record', category='statistics', date=date(2017, 8, 1))
+        HomePage.objects.get().add_child(instance=self.page)
+        self.page.save_revision().publish()
+
+    def test_only_sends_changes(self, push_document):
+        call_command('sync_search_index', stdout=mock.Mock())
+        push_document.assert_called_once_with(mock.ANY, exists=False)
+        self.assertTrue(IndexedDocument.objects.filter(page_id=self.page.id).exists())
+
+        # Nothing has changed, so nothing is sent
+        push_document.reset_mock()
+        call_command('sync_search_index', stdout=mock.Mock())
+        push_document.assert_not_called()
+
+        # A new revision with the same content isn't sent either
+        self.page.save_revision().publish()
+        call_command('sync_search_index', stdout=mock.Mock())
+        push_document.assert_not_called()
+
+    def test_dry_run(self, push_document):
+        call_command('sync_search_index', stdout=mock.Mock())
+        indexed = IndexedDocument.objects.get(page_id=self.page.id)
+
+        # A dry run doesn't record a new revision as synced
+        self.page.save_revision().publish()
+        call_command('sync_search_index', dry_run=True, stdout=mock.Mock())
+        self.assertEqual(
+            IndexedDocument.objects.get(page_id=self.page.id).revision_created_at,
+            indexed.revision_created_at)
+
+    def test_sends_moved_pages(self, push_document):
+        call_command('sync_search_index', stdout=mock.Mock())
+        push_document.reset_mock()
+
+        # Moving a page changes its path without a new revision
+        Page.objects.filter(id=self.page.id).update(url_path='/home/moved/')
+        call_command('sync_search_index', stdout=mock.Mock())
+        push_document.assert_called_once_with(mock.ANY, exists=True)
+        document = push_document.call_args[0][0]
+        self.assertTrue(document['path'].endswith('/moved/'))
+        self.assertEqual(IndexedDocument.objects.get(page_id=self.page.id).url_path, '/home/moved/')
+
+    @mock.patch('search.management.commands.sync_search_index.delete_document')
+    def test_deletes_pages_that_are_gone(self, delete_document, push_document):
+        delete_document.return_value.status_code = 200
+        call_command('sync_search_index', stdout=mock.Mock())
+        self.page.unpublish()
+        call_command('sync_search_index', stdout=mock.Mock())
+        delete_document.assert_called_once_with(self.page.id)
+        self.assertFalse(IndexedDocument.objects.exists())
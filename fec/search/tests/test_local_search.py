@@ -0,0 +1,41 @@
+from datetime import date
+
+from django.core.cache import cache
+from django.test import TestCase
+
+from home.models import HomePage, RecordPage
+from search.models import SitePage
+from search.utils.local_search import indexed_pages, remove_page, search_local, update_page
+
+
+class TestLocalSearch(TestCase):
+    def setUp(self):
+        cache.clear()
+        home_page = HomePage.objects.get()
+        self.page = RecordPage(title='Registering a committee', category='statistics', date=date(2017, 8, 1))
+        home_page.add_child(instance=self.page)
+        self.page.save_revision().publish()
+
+    def test_search(self):
+        update_page(self.page)
+        results = search_local('committees')
+        self.assertEqual(results['web']['total'], 1)
+        # It marks the matches the same way DigitalGov does
+        self.assertIn('\ue000committee\ue001', results['web']['results'][0]['title'])
+
+    def test_remove(self):
+        update_page(self.page)
+        remove_page(self.page.id)
+        self.assertFalse(SitePage.objects.exists())
+
+    def test_unpublished(self):
+        # It doesn't index pages that aren't live
+        self.page.unpublish()
+        update_page(self.page)
+        self.assertFalse(SitePage.objects.exists())
+
+    def test_indexed_pages(self):
+        # It looks up the index roots once, then finds the pages in one query
+        self.assertIn(self.page.id, [page.id for page in indexed_pages()])
+        with self.assertNumQueries(1):
+            self.assertIn(self.page.id, [page.id for page in indexed_pages()])
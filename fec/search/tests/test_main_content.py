@@ -0,0 +1,39 @@
+import os
+import unittest
+
+from search.utils import main_content
+from search.management.commands.benchmark_main_content import LAYOUTS, SAMPLES_DIR, soup_text
+
+
+class TestMainContent(unittest.TestCase):
+    def test_first_matching_selector(self):
+        html = '''
+            <html><body>
+                <nav>Menu</nav>
+                <section class="main__content--right">Sidebar</section>
+                <article class="content main">First
+line</article>
+                <article class="main">Second <b>bold</b></article>
+            </body></html>
+        '''
+        self.assertEqual(main_content.extract_text(html, main_content.CMS_CONTENT), 'First lineSecond bold')
+
+    def test_fallback_selector(self):
+        html = '<div id="fec_mainContent">Public <!-- note -->Records</div>'
+        self.assertEqual(main_content.extract_text(html, main_content.TRANSITION_CONTENT), 'Public Records')
+
+    def test_class_is_matched_whole(self):
+        html = '<article class="main-feature">Feature</article>'
+        self.assertEqual(main_content.extract_text(html, main_content.CMS_CONTENT), '')
+
+    def test_no_content(self):
+        self.assertEqual(main_content.extract_text('', main_content.WEB_APP_CONTENT), '')
+        self.assertEqual(main_content.extract_text('<p>Text</p>', main_content.WEB_APP_CONTENT), '')
+
+    def test_samples_match_soup(self):
+        for file_name, (selectors, finds) in LAYOUTS.items():
+            with open(os.path.join(SAMPLES_DIR, file_name)) as sample:
+                html = sample.read()
+            text = main_content.extract_text(html, selectors)
+            self.assertTrue(text)
+            self.assertEqual(text.split(), soup_text(html, finds).split())
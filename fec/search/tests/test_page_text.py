@@ -0,0 +1,25 @@
+import json
+
+from datetime import date
+
+from django.test import TestCase
+
+from home.models import HomePage, RecordPage
+from search.utils.page_text import get_page_text
+
+
+class TestPageText(TestCase):
+    def test_stream_field_text(self):
+        page = RecordPage(title='Record', category='statistics', date=date(2017, 8, 1), body=json.dumps([
+            {'type': 'heading', 'value': 'Filing deadlines'},
+            {'type': 'paragraph', 'value': '<p>Reports are <b>due</b></p><p>April&nbsp;15</p>'},
+            {'type': 'html', 'value': '<div class="callout">Q&amp;A</div>'},
+            {'type': 'table', 'value': {'data': [['Report', 'Due'], ['Q1', None]]}},
+        ]))
+        HomePage.objects.get().add_child(instance=page)
+
+        # It works without the page being live, and keeps words apart
+        self.assertEqual(
+            get_page_text(page),
+            'Filing deadlines Reports are due April 15 Q&A Report Due Q1'
+        )
@@ -0,0 +1,61 @@
+import threading
+import time
+
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import TestCase
+
+from search.utils import search_cache
+from search.utils.search_cache import cached_search, search_cache_key
+
+
+class TestSearchCache(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_cache_key(self):
+        # It ignores case and extra whitespace, but not the page
+        self.assertEqual(search_cache_key('site', 'Hillary  Clinton'), search_cache_key('site', 'hillary clinton'))
+        self.assertNotEqual(search_cache_key('site', 'clinton'), search_cache_key('site', 'clinton', offset=10))
+        self.assertNotEqual(search_cache_key('site', 'clinton'), search_cache_key('candidates', 'clinton'))
+
+    def test_cached(self):
+        search = mock.Mock(return_value={'results': [{'name': 'Abe Lincoln'}]})
+        cached_search('candidates', search, 'abe')
+        results = cached_search('candidates', search, 'Abe')
+        self.assertEqual(results, {'results': [{'name': 'Abe Lincoln'}]})
+        self.assertEqual(search.call_count, 1)
+
+    @mock.patch.object(search_cache.cache, 'set')
+    def test_empty_results(self, cache_set):
+        # It caches empty results for less time, and failures not at all
+        cached_search('candidates', mock.Mock(return_value={'results': []}), 'zzz')
+        self.assertEqual(cache_set.call_args[0][2], search_cache.EMPTY_SEARCH_CACHE_TIMEOUT)
+
+        cache_set.reset_mock()
+        cached_search('site', mock.Mock(return_value=None), 'zzz')
+        cache_set.assert_not_called()
+
+    def test_single_flight(self):
+        # Identical searches at the same time make one request between them
+        def slow_search():
+            time.sleep(0.2)
+            return {'results': [{'name': 'Abe Lincoln'}]}
+        search = mock.Mock(side_effect=slow_search)
+        key = search_cache_key('candidates', 'abe')
+
+        # The threads don't use the cache, which would open database
+        # connections outside the test's transaction
+        results = []
+        threads = [
+            threading.Thread(target=lambda: results.append(search_cache.single_flight(key, search)))
+            for i in range(5)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(search.call_count, 1)
+        self.assertEqual(len(results), 5)
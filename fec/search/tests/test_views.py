@@ -2,11 +2,14 @@ import unittest
 import requests
 import requests_mock
 import re
+import time
 import search.views as views
 
 from django.conf import settings
+from django.core.cache import cache
 from django.test import Client, TestCase, RequestFactory
 from unittest import mock
+from search.utils.search_cache import search_cache_key
 from search.views import (
     search_candidates,
     search_committees,
@@ -25,6 +28,7 @@ search_url = re.compile('https://search.usa.gov/api/v2/search/i14y')
 @requests_mock.Mocker()
 class TestViews(TestCase):
     def setUp(self):
+        cache.clear()
         self.client = Client()
         self.factory = RequestFactory()
 
@@ -76,6 +80,16 @@ class TestViews(TestCase):
         self.assertEqual(history.qs['q'], ['america'])
 
 
+    def test_search_candidates_error(self, m):
+        # An error from the API is raised instead of cached as results
+        m.register_uri('GET', candidate_url, status_code=500, json={'message': 'Internal error'})
+        request = self.factory.get('/search?query=abe&type=candidates')
+        response = search(request)
+        self.assertTrue(m.called)
+        self.assertIn(b'Some results are unavailable', response.content)
+        self.assertIsNone(cache.get(search_cache_key('candidates', 'abe')))
+
+
     def test_process_site_results(self, m):
         results = {
             'web': {
@@ -162,3 +176,62 @@ class TestViews(TestCase):
         request = self.factory.get('/search?query=abe&type=candidates')
         response = search(request)
         search_site.assert_not_called()
+
+
+    @mock.patch.dict(views.SEARCH_DEADLINES, {'candidates': 0.1})
+    @mock.patch.object(views, 'search_committees')
+    @mock.patch.object(views, 'search_candidates')
+    def test_search_partial_results(self, m, search_candidates, search_committees):
+        # It renders the results it has when a search runs out of time
+        search_candidates.side_effect = lambda query: time.sleep(1)
+        search_committees.return_value = {'results': [{'name': 'Abe for USA'}], 'pagination': {'count': 1}}
+        # The slow search carries on after the test, so use a query no other
+        # test does, or they'd wait for it
+        request = self.factory.get('/search?query=abe+for+usa&type=candidates&type=committees')
+        started = time.time()
+        response = search(request)
+        self.assertLess(time.time() - started, 1)
+        self.assertEqual(response.status_code, 200)
+        self.assertIn(b'Some results are unavailable', response.content)
+        self.assertIn(b'Abe for USA', response.content)
+
+
+    @mock.patch.object(views, 'search_committees')
+    def test_search_failed_backend(self, m, search_committees):
+        search_committees.side_effect = requests.ConnectionError
+        request = self.factory.get('/search?query=help&type=committees')
+        response = search(request)
+        self.assertEqual(response.status_code, 200)
+        self.assertIn(b'Some results are unavailable', response.content)
+
+
+    @mock.patch.object(views, 'search_local')
+    @mock.patch.object(views, 'search_site')
+    def test_site_search_fallback(self, m, search_site, search_local):
+        # It searches the local index when DigitalGov search fails
+        search_site.side_effect = requests.ConnectionError
+        search_local.return_value = {
+            'web': {
+                'results': [{'title': '\ue000Help\ue001', 'url': 'https://www.fec.gov/help/', 'snippet': ''}],
+                'total': 1,
+                'next_offset': None,
+            },
+            'text_best_bets': [],
+        }
+        request = self.factory.get('/search?query=help&type=site')
+        response = search(request)
+        search_local.assert_called_with('help', limit=10, offset=0)
+        self.assertIn(b'<span class="t-highlight">Help</span>', response.content)
+        self.assertNotIn(b'Some results are unavailable', response.content)
+
+
+    @mock.patch.object(views, 'search_local')
+    @mock.patch.object(views, 'search_site')
+    def test_site_search_fallback_failed(self, m, search_site, search_local):
+        # It still renders when the local search fails too
+        search_site.side_effect = requests.ConnectionError
+        search_local.side_effect = Exception('The database is down')
+        request = self.factory.get('/search?query=help&type=site')
+        response = search(request)
+        self.assertEqual(response.status_code, 200)
+        self.assertIn(b'Some results are unavailable', response.content)
@@ -0,0 +1,70 @@
+"""
+Which pages belong in the search indexes: the descendants of the pages in
+constants.SEARCH_DESCENDANTS_OF and the children of the pages in
+constants.SEARCH_CHILDREN_OF.
+
+Pages are classified by their treebeard `path` and `depth` alone. A page is
+a descendant of a root if its path starts with the root's path and it's
+deeper, and a child if it's exactly one level deeper. Only the roots' paths
+need looking up, and they're cached, so checking one page takes no queries
+and a whole queryset can be narrowed in SQL.
+"""
+from django.core.cache import cache
+from django.db.models import Q
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+
+from wagtail.wagtailcore.models import Page
+
+from fec import constants
+
+INDEX_ROOTS_KEY = 'search:index-roots'
+INDEX_ROOTS_TIMEOUT = 60 * 60
+
+
+def get_index_roots():
+    """
+    Returns ([(path, depth), ...], [(path, depth), ...]) for the roots whose
+    descendants and whose children are indexed
+    """
+    roots = cache.get(INDEX_ROOTS_KEY)
+    if roots is None:
+        pages = Page.objects.filter(
+            url_path__in=constants.SEARCH_DESCENDANTS_OF + constants.SEARCH_CHILDREN_OF
+        ).values_list('url_path', 'path', 'depth')
+        roots = (
+            [(path, depth) for url_path, path, depth in pages if url_path in constants.SEARCH_DESCENDANTS_OF],
+            [(path, depth) for url_path, path, depth in pages if url_path in constants.SEARCH_CHILDREN_OF],
+        )
+        cache.set(INDEX_ROOTS_KEY, roots, INDEX_ROOTS_TIMEOUT)
+    return roots
+
+
+def is_indexable(page):
+    """Whether a page is in a section of the site that we index"""
+    descendants_of, children_of = get_index_roots()
+    return any(
+        page.path.startswith(path) and page.depth > depth for path, depth in descendants_of
+    ) or any(
+        page.path.startswith(path) and page.depth == depth + 1 for path, depth in children_of
+    )
+
+
+def filter_indexable(pages):
+    """Narrows a queryset of pages to the ones in sections that we index"""
+    descendants_of, children_of = get_index_roots()
+    predicate = Q(pk__in=[])
+    for path, depth in descendants_of:
+        predicate |= Q(path__startswith=path, depth__gt=depth)
+    for path, depth in children_of:
+        predicate |= Q(path__startswith=path, depth=depth + 1)
+    return pages.filter(predicate)
+
+
+@receiver(post_save, sender=Page)
+def clear_index_roots(sender, instance, **kwargs):
+    """
+    Page.move() saves the moved page as a plain Page, and moving a root or
+    one of its ancestors changes the root's path
+    """
+    cache.delete(INDEX_ROOTS_KEY)
@@ -0,0 +1,66 @@
+"""
+A local full-text index of the CMS pages we send to DigitalGov search, for
+when DigitalGov is slow or down.
+
+It covers the same live, public pages as scrape_cms_pages: the descendants
+of constants.SEARCH_DESCENDANTS_OF and the children of
+constants.SEARCH_CHILDREN_OF. The page hooks keep it up to date as pages are
+edited, and search_local() returns results in the same format as a
+DigitalGov search response.
+"""
+from django.conf import settings
+
+from wagtail.wagtailcore.models import Page
+
+from search.models import SitePage
+from search.utils.indexability import filter_indexable
+from search.utils.page_text import get_page_text
+from search.utils.search_indexing import check_ancestors
+
+
+def indexed_pages():
+    """Every live, public page in a section of the site that we index"""
+    return filter_indexable(Page.objects.live().public())
+
+
+def update_page(page):
+    """
+    Adds or updates a page in the local index if it's live, public and in a
+    section we index, or removes it if it isn't
+    """
+    queried_page = Page.objects.live().public().filter(id=page.id).first()
+    if queried_page:
+        queried_page = check_ancestors(queried_page)
+
+    if queried_page:
+        page = queried_page.specific
+        content = ' '.join([page.search_description or '', get_page_text(page)])
+        SitePage.update_for_page(page, settings.CANONICAL_BASE + page.url, content)
+    else:
+        remove_page(page.id)
+
+
+def remove_page(page_id):
+    SitePage.objects.filter(page_id=page_id).delete()
+
+
+def search_local(query, limit=10, offset=0):
+    """
+    Searches the local index and returns the results in the same format as
+    a DigitalGov search response, with the matches in the titles and
+    snippets marked for highlight_matches
+    """
+    limit, offset = int(limit), int(offset)
+    matches = SitePage.objects.search(query)
+    count = matches.count()
+    return {
+        'web': {
+            'results': [
+                {'title': match.headline, 'url': match.url, 'snippet': match.snippet}
+                for match in matches[offset:offset + limit]
+            ],
+            'total': count,
+            'next_offset': offset + limit if offset + limit < count else None,
+        },
+        'text_best_bets': [],
+    }
@@ -0,0 +1,54 @@
+"""
+Pulls the text of the main content area out of a page's HTML, for the
+scrapers that build documents for DigitalGov Search.
+
+Each layout has a list of selectors that are tried in order, and the first
+one that matches anything is used. The selectors are compiled once, and the
+text is collected into a list and joined once, so extracting is linear in the
+size of the page.
+"""
+import lxml.html
+
+from lxml import etree
+
+
+def has_class(name):
+    return "contains(concat(' ', normalize-space(@class), ' '), ' {} ')".format(name)
+
+
+ARTICLE_MAIN = etree.XPath('//article[{}]'.format(has_class('main')))
+SECTION_MAIN_RIGHT = etree.XPath('//section[{}]'.format(has_class('main__content--right')))
+TRANSITION_MAIN_WIDE = etree.XPath("//div[@id='fec_mainContentWide']")
+TRANSITION_MAIN = etree.XPath("//div[@id='fec_mainContent']")
+WEB_APP_MAIN = etree.XPath("//main[@id='main']")
+
+# Pages from the CMS
+CMS_CONTENT = [ARTICLE_MAIN, SECTION_MAIN_RIGHT]
+
+# Pages on transition.fec.gov
+TRANSITION_CONTENT = [TRANSITION_MAIN_WIDE, TRANSITION_MAIN]
+
+# Pages from the data web app
+WEB_APP_CONTENT = [WEB_APP_MAIN]
+
+
+def extract_text(html, selectors):
+    """
+    Returns the text of every element matched by the first of `selectors`
+    that matches anything, with newlines turned into spaces
+    """
+    if not html or not html.strip():
+        return ''
+    tree = lxml.html.document_fromstring(html)
+
+    for selector in selectors:
+        elements = selector(tree)
+        if elements:
+            break
+    else:
+        return ''
+
+    text = []
+    for element in elements:
+        text.extend(element.itertext())
+    return ''.join(text).replace('\n', ' ')
@@ -0,0 +1,67 @@
+"""
+Plain text of a page's content for the search indexes, read straight from
+its StreamFields and rich text fields.
+
+This replaces scraping the published page over HTTP: it needs no request to
+the public site, and works for pages that aren't live yet.
+"""
+import html
+
+from django.utils.html import strip_tags
+
+from wagtail.contrib.table_block.blocks import TableBlock
+from wagtail.wagtailcore import blocks
+from wagtail.wagtailcore.fields import RichTextField, StreamField
+
+
+def html_text(value):
+    """The text of some HTML, with a space where each tag was"""
+    return html.unescape(strip_tags((value or '').replace('<', ' <')))
+
+
+def block_text(block, value):
+    """
+    Yields the text of a block's value. Only blocks that hold prose count, so
+    things like URLs, choices and chosen pages or images are left out.
+    """
+    if value is None:
+        return
+    if isinstance(block, blocks.RichTextBlock):
+        yield html_text(value.source)
+    elif isinstance(block, blocks.RawHTMLBlock):
+        yield html_text(str(value))
+    elif isinstance(block, (blocks.CharBlock, blocks.TextBlock)):
+        yield str(value)
+    elif isinstance(block, TableBlock):
+        for row in value.get('data') or []:
+            for cell in row:
+                if cell:
+                    yield str(cell)
+    elif isinstance(block, blocks.StructBlock):
+        for name, child_block in block.child_blocks.items():
+            yield from block_text(child_block, value.get(name))
+    elif isinstance(block, blocks.ListBlock):
+        for item in value:
+            yield from block_text(block.child_block, item)
+    elif isinstance(block, blocks.StreamBlock):
+        yield from stream_text(value)
+
+
+def stream_text(stream_value):
+    for child in stream_value or []:
+        yield from block_text(child.block, child.value)
+
+
+def get_page_text(page):
+    """
+    Returns the text of every StreamField (body, sections, agenda,
+    imported_html, ...) and rich text field on a page, as one string
+    """
+    page = page.specific
+    text = []
+    for field in page._meta.get_fields():
+        if isinstance(field, StreamField):
+            text.extend(stream_text(getattr(page, field.name)))
+        elif isinstance(field, RichTextField):
+            text.append(html_text(getattr(page, field.name)))
+    return ' '.join(' '.join(text).split())
@@ -0,0 +1,102 @@
+"""
+Caching for the candidate, committee and site searches.
+
+Results are cached by backend, query, offset and limit. Searches that found
+nothing are cached too, for less time, so a typo that's searched over and
+over doesn't go upstream every time. Failed searches aren't cached.
+
+While a search is running, identical searches in the same worker wait for
+its results instead of making their own request, so a burst of people
+searching for the same thing costs one request per worker.
+
+The cache is the database cache, so it should only be read and written on
+the request's own thread; single_flight() itself doesn't touch it and can
+run in a thread pool.
+"""
+import hashlib
+import threading
+
+from django.core.cache import cache
+
+# Seconds to keep results, and results that were empty
+SEARCH_CACHE_TIMEOUT = 5 * 60
+EMPTY_SEARCH_CACHE_TIMEOUT = 60
+
+
+def normalize_query(query):
+    """Lowercases the query and collapses whitespace"""
+    return ' '.join(query.lower().split())
+
+
+def search_cache_key(backend, query, offset=0, limit=0):
+    value = '{}:{}:{}'.format(normalize_query(query), offset, limit)
+    return 'search:{}:{}'.format(backend, hashlib.md5(value.encode('utf-8')).hexdigest())
+
+
+def is_empty(results):
+    """Whether a search found nothing, including site search suggestions"""
+    best_bets = results.get('best_bets') or {}
+    return not results.get('results') and not best_bets.get('results')
+
+
+class Flight(object):
+    """A search in progress that identical searches can wait for"""
+    def __init__(self):
+        self.done = threading.Event()
+        self.results = None
+        self.error = None
+
+
+flights = {}
+flights_lock = threading.Lock()
+
+
+def single_flight(key, search_function):
+    """
+    Calls search_function(), unless a call for the same key is already in
+    progress, in which case it waits for that one and returns its results
+    or raises its error
+    """
+    with flights_lock:
+        flight = flights.get(key)
+        leader = flight is None
+        if leader:
+            flight = flights[key] = Flight()
+
+    if not leader:
+        flight.done.wait()
+        if flight.error is not None:
+            raise flight.error
+        return flight.results
+
+    try:
+        flight.results = search_function()
+    except Exception as error:
+        flight.error = error
+        raise
+    finally:
+        with flights_lock:
+            del flights[key]
+        flight.done.set()
+    return flight.results
+
+
+def cache_results(key, results):
+    """Caches the results of a search, unless it failed and returned None"""
+    if results is not None:
+        timeout = EMPTY_SEARCH_CACHE_TIMEOUT if is_empty(results) else SEARCH_CACHE_TIMEOUT
+        cache.set(key, results, timeout)
+
+
+def cached_search(backend, search_function, query, offset=0, limit=0):
+    """
+    Returns the cached results of a search, or calls search_function() and
+    caches what it returns. search_function can return None when the search
+    failed, which isn't cached.
+    """
+    key = search_cache_key(backend, query, offset=offset, limit=limit)
+    results = cache.get(key)
+    if results is None:
+        results = single_flight(key, search_function)
+        cache_results(key, results)
+    return results
@@ -1,10 +1,14 @@
-import requests
+import logging
 
-from bs4 import BeautifulSoup
 from django.conf import settings
 
 from wagtail.wagtailcore.models import Page
-from fec import constants
+from fec import http
+from search.models import IndexedDocument, SearchIndexJob
+from search.utils.indexability import is_indexable
+from search.utils.page_text import get_page_text
+
+logger = logging.getLogger(__name__)
 
 # Only use the real search engine if we're on production
 if settings.FEC_CMS_ENVIRONMENT == 'PRODUCTION':
@@ -17,30 +21,6 @@ else:
     DIGITALGOV_DRAWER_HANDLE = ''
 
 
-def scrape_page_content(url):
-    """
-    Scrapes the content for a given URL
-
-    :arg str url: The url (in production) of the page to scrape_page_content
-    :returns str : Returns the content scraped from that page
-    """
-    r  = requests.get(url)
-    data = r.text
-    soup = BeautifulSoup(data, 'lxml')
-    text = ''
-
-    # First look for an article. If that's not there, look for this section
-    article = soup.find_all('article', class_="main")
-    if not article:
-        main = soup.find_all('section', class_="main__content--right")
-
-    content = article if article else main
-
-    for tag in content:
-        text = text + tag.get_text().replace('\n', ' ')
-    return text
-
-
 def create_search_index_doc(page):
     """
     Creates a dict in the format required to POST/PUT to i14y
@@ -63,8 +43,7 @@ def create_search_index_doc(page):
       "language": "en",
     }
 
-    # Go scrape the content
-    doc['content'] = scrape_page_content(live_url)
+    doc['content'] = get_page_text(page)
 
     # If we've added a custom search description, add that
     if page.search_description:
@@ -76,44 +55,76 @@ def create_search_index_doc(page):
     return doc
 
 
+def post_document(document):
+    """Adds a document to i14y. A 422 means it's already there."""
+    url = '{}/documents'.format(DIGITALGOV_BASE_URL)
+    return http.post('i14y', url, auth=(DIGITALGOV_DRAWER_HANDLE, DIGITALGOV_DRAWER_KEY), data=document)
+
+
+def put_document(document):
+    """Updates a document in i14y. A 400 means it isn't there yet."""
+    url = '{}/documents/{}'.format(DIGITALGOV_BASE_URL, document.get('document_id'))
+    return http.put('i14y', url, auth=(DIGITALGOV_DRAWER_HANDLE, DIGITALGOV_DRAWER_KEY), data=document)
+
+
+def delete_document(document_id):
+    url = '{}/documents/{}'.format(DIGITALGOV_BASE_URL, document_id)
+    return http.delete('i14y', url, auth=(DIGITALGOV_DRAWER_HANDLE, DIGITALGOV_DRAWER_KEY))
+
+
+def push_document(document, exists=False):
+    """
+    Sends a document to i14y with a PUT if we expect it's already indexed or a
+    POST if not, and then the other one if i14y says otherwise.
+    Returns True if the document was saved.
+    """
+    if exists:
+        r = put_document(document)
+        if r.status_code == 400:
+            r = post_document(document)
+    else:
+        r = post_document(document)
+        if r.status_code == 422:
+            r = put_document(document)
+    return r.status_code in (200, 201)
+
+
 def add_document(page):
     """
     Makes a POST request to i14y to add a new document with the information
     of the edited page
+    Raises requests.HTTPError if i14y doesn't accept it
 
     :arg obj page: A page object returned from a database query
     """
     document = create_search_index_doc(page)
-    url = '{}/documents'.format(DIGITALGOV_BASE_URL)
-    r = requests.post(url, auth=(DIGITALGOV_DRAWER_HANDLE, DIGITALGOV_DRAWER_KEY), data=document)
+    r = post_document(document)
     # A 422 means the page already exists,
     if r.status_code == 422:
-        print('{} already exists'.format(document['document_id']))
+        logger.info('Search index: %s already exists', document['document_id'])
         update_document(page)
-    elif r.status_code == 201:
-        print('Search index: created {}'.format(document['document_id']))
-    else:
-        print('Search index: could not create {}'.format(document['document_id']))
-        print(r.__dict__)
+        return
+    r.raise_for_status()
+    IndexedDocument.record(page, document)
+    logger.info('Search index: created %s', document['document_id'])
 
 
 def update_document(page):
     """
     Makes a PUT request to i14y to update the information of the edited page
     If the request results in a 400, then the page needs to be added
+    Raises requests.HTTPError if i14y doesn't accept it
 
     :arg obj page: A page object returned from a database query
     """
     document = create_search_index_doc(page)
-    url = '{}/documents/{}'.format(DIGITALGOV_BASE_URL, document.get('document_id'))
-    r = requests.put(url, auth=(DIGITALGOV_DRAWER_HANDLE, DIGITALGOV_DRAWER_KEY), data=document)
+    r = put_document(document)
     if r.status_code == 400:
         add_document(page)
-    elif r.status_code == 200:
-        print('Search index: updated {}'.format(document['document_id']))
-    else:
-        print('Search index: could not update {}'.format(document['document_id']))
-        print(r.__dict__)
+        return
+    r.raise_for_status()
+    IndexedDocument.record(page, document)
+    logger.info('Search index: updated %s', document['document_id'])
 
 
 def handle_page_edit_or_create(page, method):
@@ -147,39 +158,43 @@ def handle_page_edit_or_create(page, method):
 
 def check_ancestors(page):
     """
-    First, check if the page's parent is one for which we want to index
-    the direct children of (constants.SEARCH_CHILDREN_OF)
-
-    If that's not the case, check all ancestors for any page we want all
-    descendants of (constants.SEARCH_DESCENDANTS_OF)
+    Checks whether the page is a direct child of a page for which we want to
+    index the children (constants.SEARCH_CHILDREN_OF), or a descendant of a
+    page for which we want all descendants (constants.SEARCH_DESCENDANTS_OF).
 
-    If there's a match in there, return the page objects
+    This compares the page's tree path with the cached paths of those pages,
+    so it doesn't query the page's parent or ancestors.
 
     :arg obj page: A page returned from a database query
-    :returns obj page: The same page that was passed in
+    :returns obj page: The same page that was passed in, or None
     """
-    ancestors = page.get_ancestors()
-    parent = page.get_parent()
-    if parent.url_path in constants.SEARCH_CHILDREN_OF:
-        return page
-    else:
-        valid_ancestors = [a for a in ancestors if a.url_path in constants.SEARCH_DESCENDANTS_OF]
-        if valid_ancestors:
-            return page
-        else:
-            return None
+    return page if is_indexable(page) else None
 
 
 def handle_page_delete(page_id):
     """
     When a page is deleted on production, this will delete it from the i14y index
+    Raises requests.HTTPError if i14y doesn't accept it
 
     :arg int page_id: The ID of the page to deleted
     """
     if settings.FEC_CMS_ENVIRONMENT == 'PRODUCTION':
-        url = '{}/documents/{}'.format(DIGITALGOV_BASE_URL, page_id)
-        r = requests.delete(url, auth=(DIGITALGOV_DRAWER_HANDLE, DIGITALGOV_DRAWER_KEY))
-        if r.status_code == 200:
-            print('Search index: deleted {}'.format(page_id))
-        else:
-            print('Search index: could not delete {}'.format(page_id))
+        r = delete_document(page_id)
+        r.raise_for_status()
+        IndexedDocument.objects.filter(page_id=page_id).delete()
+        logger.info('Search index: deleted %s', page_id)
+
+
+def queue_page_update(page):
+    """
+    Queues a page to be added to or updated in the i14y index by
+    process_search_index_queue, instead of while the editor waits
+    """
+    if settings.FEC_CMS_ENVIRONMENT == 'PRODUCTION':
+        SearchIndexJob.enqueue(page.id, SearchIndexJob.INDEX)
+
+
+def queue_page_delete(page_id):
+    """Queues a page to be deleted from the i14y index"""
+    if settings.FEC_CMS_ENVIRONMENT == 'PRODUCTION':
+        SearchIndexJob.enqueue(page_id, SearchIndexJob.DELETE)
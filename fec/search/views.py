@@ -1,25 +1,56 @@
 import os
-import requests
+import logging
 import json
+import time
 
+from concurrent import futures
 from urllib import parse
 
 from django.shortcuts import render
 from django.conf import settings
+from django.core.cache import cache
+from django.db import connection
+
+from fec import http
+from search.utils.local_search import search_local
+from search.utils.search_cache import cache_results, search_cache_key, single_flight
+
+logger = logging.getLogger(__name__)
+
+# Seconds each backend has to answer before the page renders without it
+SEARCH_DEADLINES = {
+    'candidates': 2,
+    'committees': 2,
+    'site': 4,
+}
+
+# Shared by every request, so the searches don't start new threads each time.
+# Under gunicorn's gevent workers these threads are greenlets.
+search_executor = futures.ThreadPoolExecutor(max_workers=30)
 
 def search_candidates(query):
-    """Searches the data API for candidates matching the query"""
+    """
+    Searches the data API for candidates matching the query. Raises
+    requests.HTTPError for an error response, so it isn't cached.
+    """
     path = os.path.join(settings.FEC_API_VERSION, 'candidates', 'search')
     url = parse.urljoin(settings.FEC_API_URL, path)
-    r = requests.get(url, params={'q': query, 'sort': '-receipts', 'per_page': 3, 'api_key': settings.FEC_API_KEY})
+    r = http.get('fec-api', url, params={'q': query, 'sort': '-receipts', 'per_page': 3, 'api_key': settings.FEC_API_KEY},
+                 timeout=SEARCH_DEADLINES['candidates'])
+    r.raise_for_status()
     return r.json()
 
 
 def search_committees(query):
-    """Searches the data API for committees matching the query"""
+    """
+    Searches the data API for committees matching the query. Raises
+    requests.HTTPError for an error response, so it isn't cached.
+    """
     path = os.path.join(settings.FEC_API_VERSION, 'committees')
     url = parse.urljoin(settings.FEC_API_URL, path)
-    r = requests.get(url, params={'q': query, 'per_page': 3, 'sort': '-receipts', 'api_key': settings.FEC_API_KEY})
+    r = http.get('fec-api', url, params={'q': query, 'per_page': 3, 'sort': '-receipts', 'api_key': settings.FEC_API_KEY},
+                 timeout=SEARCH_DEADLINES['committees'])
+    r.raise_for_status()
     return r.json()
 
 
@@ -91,12 +122,64 @@ def search_site(query, limit=0, offset=0):
         'limit': limit,
         'offset': offset
     }
-    r = requests.get('https://search.usa.gov/api/v2/search/i14y', params=params)
+    r = http.get('digitalgov', 'https://search.usa.gov/api/v2/search/i14y', params=params,
+                 timeout=SEARCH_DEADLINES['site'])
 
     if r.status_code == 200:
         return process_site_results(r.json(), limit=limit, offset=offset)
 
 
+def search_site_locally(query, limit=0, offset=0):
+    """Searches our own index of CMS pages, for when DigitalGov search fails"""
+    return process_site_results(search_local(query, limit=limit, offset=offset), limit=limit, offset=offset)
+
+
+def run_search(key, search_function):
+    """
+    Runs a search in the thread pool, closing the thread's database
+    connection afterwards in case the search opened one
+    """
+    try:
+        return single_flight(key, search_function)
+    finally:
+        connection.close()
+
+
+def gather_searches(searches):
+    """
+    Takes a (cache key, search function) pair by search type. Runs each search
+    that isn't cached concurrently and waits for each one until its deadline
+    in SEARCH_DEADLINES. Returns the results by search type and a list of the
+    types that failed or ran out of time.
+
+    The cache is read and written here on the request's thread, so the pool's
+    threads only make the HTTP requests.
+    """
+    start = time.time()
+    results = {}
+    running = {}
+    for search_type, (key, search_function) in searches.items():
+        cached = cache.get(key)
+        if cached is not None:
+            results[search_type] = cached
+        else:
+            running[search_type] = (key, search_executor.submit(run_search, key, search_function))
+
+    unavailable = []
+    for search_type, (key, future) in running.items():
+        remaining = max(start + SEARCH_DEADLINES[search_type] - time.time(), 0)
+        try:
+            results[search_type] = future.result(timeout=remaining)
+            cache_results(key, results[search_type])
+        except futures.TimeoutError:
+            logger.warning('The %s search ran out of time', search_type)
+            unavailable.append(search_type)
+        except Exception:
+            logger.exception('The %s search failed', search_type)
+            unavailable.append(search_type)
+    return results, unavailable
+
+
 def search(request):
     """
     Takes a page request and calls the appropriate searches
@@ -109,25 +192,42 @@ def search(request):
     search_type = request.GET.getlist('type', ['site'])
     results = {}
     results['count'] = 0
-
-    if 'candidates' in search_type and search_query:
-        results['candidates'] = search_candidates(search_query)
-        if results['candidates']:
-            results['count'] += len(results['candidates']['results'])
-
-    if 'committees' in search_type and search_query:
-        results['committees'] = search_committees(search_query)
-        if results['committees']:
-            results['count'] += len(results['committees']['results'])
-
-    if 'site' in search_type and search_query:
-        results['site'] = search_site(search_query, limit=limit, offset=offset)
-        if results['site']:
-            results['count'] += len(results['site']['results'])
+    unavailable = []
+
+    if search_query:
+        searches = {}
+        if 'candidates' in search_type:
+            searches['candidates'] = (
+                search_cache_key('candidates', search_query),
+                lambda: search_candidates(search_query))
+        if 'committees' in search_type:
+            searches['committees'] = (
+                search_cache_key('committees', search_query),
+                lambda: search_committees(search_query))
+        if 'site' in search_type:
+            searches['site'] = (
+                search_cache_key('site', search_query, offset=offset, limit=limit),
+                lambda: search_site(search_query, limit=limit, offset=offset))
+
+        found, unavailable = gather_searches(searches)
+        results.update(found)
+        if 'site' in searches and not results.get('site'):
+            # DigitalGov search failed or ran out of time, so fall back to ours
+            try:
+                results['site'] = search_site_locally(search_query, limit=limit, offset=offset)
+                unavailable = [t for t in unavailable if t != 'site']
+            except Exception:
+                logger.exception('The local site search failed')
+                if 'site' not in unavailable:
+                    unavailable.append('site')
+        for key in ['candidates', 'committees', 'site']:
+            if results.get(key):
+                results['count'] += len(results[key]['results'])
 
     return render(request, 'search/search.html', {
         'search_query': search_query,
         'results': results,
         'type': search_type,
+        'unavailable': unavailable,
         'self': {'title': 'Search results'}
     })
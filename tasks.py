@@ -125,6 +125,10 @@ def deploy(ctx, space=None, branch=None, login=None, yes=False):
     cmd = 'zero-downtime-push' if deployed.ok else 'push'
     ctx.run('cf {0} cms -f manifest_{1}.yml'.format(cmd, space), echo=True)
 
+    # Deploy the worker, which works through the queues the cms fills.
+    # It has no route, so a plain push is enough.
+    ctx.run('cf push cms-worker -f manifest_{0}.yml'.format(space), echo=True)
+
 
 @task
 def notify(ctx):